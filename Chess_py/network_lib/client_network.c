@@ -1,131 +1,439 @@
-// client_network.c
-#include <stdio.h>
-#include <stdlib.h>
-#include <string.h>
-#include <unistd.h>
-#include <sys/socket.h>
-#include <arpa/inet.h>
-#include <errno.h>
-
-// Connect to server
-int connect_to_server(const char *host, int port)
-{
-    int sock = 0;
-    struct sockaddr_in serv_addr;
-
-    if ((sock = socket(AF_INET, SOCK_STREAM, 0)) < 0)
-    {
-        return -1;
-    }
-
-    // Set timeout
-    struct timeval timeout;
-    timeout.tv_sec = 5;
-    timeout.tv_usec = 0;
-    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, (char *)&timeout, sizeof(timeout));
-    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, (char *)&timeout, sizeof(timeout));
-
-    serv_addr.sin_family = AF_INET;
-    serv_addr.sin_port = htons(port);
-
-    if (inet_pton(AF_INET, host, &serv_addr.sin_addr) <= 0)
-    {
-        close(sock);
-        return -2;
-    }
-
-    if (connect(sock, (struct sockaddr *)&serv_addr, sizeof(serv_addr)) < 0)
-    {
-        close(sock);
-        return -3;
-    }
-
-    return sock;
-}
-
-// Disconnect from server
-void disconnect_server(int sock)
-{
-    if (sock > 0)
-    {
-        close(sock);
-    }
-}
-
-// Check if connection is still alive
-// Returns: 1 if connected, 0 if disconnected
-int check_connection(int sock)
-{
-    if (sock <= 0) return 0;
-    
-    // Try to send 0 bytes with MSG_NOSIGNAL to check connection
-    // If socket is broken, send will return -1 with errno set
-    char dummy = 0;
-    int result = send(sock, &dummy, 0, MSG_NOSIGNAL);
-    
-    if (result < 0)
-    {
-        // Check if it's a real disconnect or just a non-blocking issue
-        if (errno == EPIPE || errno == ECONNRESET || errno == ENOTCONN)
-        {
-            return 0; // Disconnected
-        }
-    }
-    
-    return 1; // Still connected
-}
-
-// Send message (appends newline)
-int send_message(int sock, const char *message)
-{
-    if (sock <= 0) return -1;
-
-    size_t len = strlen(message);
-    char *buffer = malloc(len + 2);
-    if (!buffer) return -1;
-
-    strcpy(buffer, message);
-    buffer[len] = '\n';
-    buffer[len + 1] = '\0';
-
-    int sent = send(sock, buffer, len + 1, 0);
-    free(buffer);
-
-    return (sent == len + 1) ? 0 : -1;
-}
-
-// Receive message (reads until newline)
-int receive_message(int sock, char *buffer, int size)
-{
-    if (sock <= 0) return -1;
-
-    // Clear buffer
-    memset(buffer, 0, size);
-
-    int total = 0;
-    char c;
-    
-    // Read 1 byte at a time to avoid over-reading next message
-    while (total < size - 1)
-    {
-        int n = recv(sock, &c, 1, 0);
-        
-        if (n <= 0) {
-            // Error or connection closed
-            if (total > 0) {
-                buffer[total] = '\0';
-                return total;
-            }
-            return -1;
-        }
-        
-        buffer[total++] = c;
-        
-        if (c == '\n') {
-            break; // Message complete
-        }
-    }
-
-    buffer[total] = '\0';
-    return total;
-}
+// client_network.c
+// Build: gcc -shared -fPIC -O2 -pthread -o client_network.so client_network.c
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <sys/uio.h>
+#include <arpa/inet.h>
+#include <errno.h>
+#include <poll.h>
+#include <pthread.h>
+#include <time.h>
+
+// Size of the per-socket ring buffer (one frame can never be larger)
+#define READER_CAPACITY 65536
+#define MAX_READERS 64
+
+// Buffered reader state for one socket.
+// Bytes live in data[head .. head + len) modulo READER_CAPACITY.
+// scanned counts bytes after head already known not to contain '\n'.
+// refs counts receive calls using the reader; a detached reader is freed
+// by the last of them, so disconnect_server never frees it under a receive.
+typedef struct
+{
+    int sock;
+    int refs;
+    int detached;
+    size_t head;
+    size_t len;
+    size_t scanned;
+    char data[READER_CAPACITY];
+} FrameReader;
+
+static FrameReader *readers[MAX_READERS];
+static pthread_mutex_t readers_mutex = PTHREAD_MUTEX_INITIALIZER;
+
+// Look up the reader of sock and hold it; release it with put_reader
+static FrameReader *get_reader(int sock)
+{
+    FrameReader *found = NULL;
+
+    pthread_mutex_lock(&readers_mutex);
+    for (int i = 0; i < MAX_READERS; i++)
+    {
+        if (readers[i] && readers[i]->sock == sock)
+        {
+            found = readers[i];
+            found->refs++;
+            break;
+        }
+    }
+    pthread_mutex_unlock(&readers_mutex);
+
+    return found;
+}
+
+static void put_reader(FrameReader *r)
+{
+    pthread_mutex_lock(&readers_mutex);
+    r->refs--;
+    if (r->detached && r->refs == 0)
+    {
+        free(r);
+    }
+    pthread_mutex_unlock(&readers_mutex);
+}
+
+static void attach_reader(int sock)
+{
+    pthread_mutex_lock(&readers_mutex);
+    for (int i = 0; i < MAX_READERS; i++)
+    {
+        if (!readers[i])
+        {
+            readers[i] = calloc(1, sizeof(FrameReader));
+            if (readers[i])
+            {
+                readers[i]->sock = sock;
+            }
+            break;
+        }
+    }
+    pthread_mutex_unlock(&readers_mutex);
+}
+
+static void detach_reader(int sock)
+{
+    pthread_mutex_lock(&readers_mutex);
+    for (int i = 0; i < MAX_READERS; i++)
+    {
+        if (readers[i] && readers[i]->sock == sock)
+        {
+            // A receive still running on it frees it when it returns
+            if (readers[i]->refs == 0)
+            {
+                free(readers[i]);
+            }
+            else
+            {
+                readers[i]->detached = 1;
+            }
+            readers[i] = NULL;
+            break;
+        }
+    }
+    pthread_mutex_unlock(&readers_mutex);
+}
+
+static long long now_ms(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (long long)ts.tv_sec * 1000 + ts.tv_nsec / 1000000;
+}
+
+// Pull as many bytes as the kernel has (up to the free space) into the ring.
+// timeout_ms < 0 uses the socket's SO_RCVTIMEO.
+// Returns: bytes read, 0 on timeout, -1 if the connection is closed or broken
+static int fill_reader(FrameReader *r, int timeout_ms)
+{
+    size_t free_space = READER_CAPACITY - r->len;
+    if (free_space == 0)
+    {
+        return 0;
+    }
+
+    if (timeout_ms >= 0)
+    {
+        struct pollfd pfd;
+        pfd.fd = r->sock;
+        pfd.events = POLLIN;
+        pfd.revents = 0;
+
+        int ready = poll(&pfd, 1, timeout_ms);
+        if (ready == 0)
+        {
+            return 0;
+        }
+        if (ready < 0)
+        {
+            return (errno == EINTR) ? 0 : -1;
+        }
+    }
+
+    // Free space may wrap around the end of the ring: read into both halves
+    size_t tail = (r->head + r->len) % READER_CAPACITY;
+    struct iovec iov[2];
+    int iovcnt = 1;
+
+    iov[0].iov_base = r->data + tail;
+    if (tail + free_space <= READER_CAPACITY)
+    {
+        iov[0].iov_len = free_space;
+    }
+    else
+    {
+        iov[0].iov_len = READER_CAPACITY - tail;
+        iov[1].iov_base = r->data;
+        iov[1].iov_len = free_space - iov[0].iov_len;
+        iovcnt = 2;
+    }
+
+    ssize_t n = readv(r->sock, iov, iovcnt);
+    if (n > 0)
+    {
+        r->len += n;
+        return (int)n;
+    }
+    if (n < 0 && (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR))
+    {
+        return 0;
+    }
+    return -1;
+}
+
+// Copy `count` bytes starting at head into out and consume `consume` bytes
+static void take_bytes(FrameReader *r, char *out, size_t count, size_t consume)
+{
+    size_t first = READER_CAPACITY - r->head;
+    if (first > count)
+    {
+        first = count;
+    }
+    memcpy(out, r->data + r->head, first);
+    memcpy(out + first, r->data, count - first);
+
+    r->head = (r->head + consume) % READER_CAPACITY;
+    r->len -= consume;
+    r->scanned = 0;
+    if (r->len == 0)
+    {
+        r->head = 0;
+    }
+}
+
+// Length of the next complete frame including its '\n', 0 if none yet.
+// A full ring without a newline is handed out as one (oversized) frame.
+static size_t next_frame_length(FrameReader *r)
+{
+    for (size_t i = r->scanned; i < r->len; i++)
+    {
+        if (r->data[(r->head + i) % READER_CAPACITY] == '\n')
+        {
+            return i + 1;
+        }
+    }
+    r->scanned = r->len;
+
+    return (r->len == READER_CAPACITY) ? r->len : 0;
+}
+
+// Move the next complete frame into buffer (truncated to size - 1).
+// Returns: bytes copied, 0 if no complete frame is buffered
+static int pop_frame(FrameReader *r, char *buffer, int size)
+{
+    size_t frame_len = next_frame_length(r);
+    if (frame_len == 0)
+    {
+        return 0;
+    }
+
+    size_t copy = frame_len;
+    if (copy > (size_t)(size - 1))
+    {
+        copy = size - 1;
+    }
+    take_bytes(r, buffer, copy, frame_len);
+    buffer[copy] = '\0';
+
+    return (int)copy;
+}
+
+// Connect to server
+int connect_to_server(const char *host, int port)
+{
+    int sock = 0;
+    struct sockaddr_in serv_addr;
+
+    if ((sock = socket(AF_INET, SOCK_STREAM, 0)) < 0)
+    {
+        return -1;
+    }
+
+    // Set timeout
+    struct timeval timeout;
+    timeout.tv_sec = 5;
+    timeout.tv_usec = 0;
+    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, (char *)&timeout, sizeof(timeout));
+    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, (char *)&timeout, sizeof(timeout));
+
+    serv_addr.sin_family = AF_INET;
+    serv_addr.sin_port = htons(port);
+
+    if (inet_pton(AF_INET, host, &serv_addr.sin_addr) <= 0)
+    {
+        close(sock);
+        return -2;
+    }
+
+    if (connect(sock, (struct sockaddr *)&serv_addr, sizeof(serv_addr)) < 0)
+    {
+        close(sock);
+        return -3;
+    }
+
+    attach_reader(sock);
+    return sock;
+}
+
+// Disconnect from server.
+// Safe while another thread is blocked in receive on sock (after
+// shutdown_connection): the reader is freed when that receive returns.
+void disconnect_server(int sock)
+{
+    if (sock > 0)
+    {
+        detach_reader(sock);
+        close(sock);
+    }
+}
+
+// Shut down both directions without releasing the descriptor.
+// Wakes up any thread blocked in receive on this socket; call
+// disconnect_server afterwards to close it.
+void shutdown_connection(int sock)
+{
+    if (sock > 0)
+    {
+        shutdown(sock, SHUT_RDWR);
+    }
+}
+
+// Check if connection is still alive
+// Returns: 1 if connected, 0 if disconnected
+int check_connection(int sock)
+{
+    if (sock <= 0) return 0;
+
+    // Try to send 0 bytes with MSG_NOSIGNAL to check connection
+    // If socket is broken, send will return -1 with errno set
+    char dummy = 0;
+    int result = send(sock, &dummy, 0, MSG_NOSIGNAL);
+
+    if (result < 0)
+    {
+        // Check if it's a real disconnect or just a non-blocking issue
+        if (errno == EPIPE || errno == ECONNRESET || errno == ENOTCONN)
+        {
+            return 0; // Disconnected
+        }
+    }
+
+    return 1; // Still connected
+}
+
+// Send message (appends newline)
+int send_message(int sock, const char *message)
+{
+    if (sock <= 0) return -1;
+
+    size_t len = strlen(message);
+    char *buffer = malloc(len + 2);
+    if (!buffer) return -1;
+
+    strcpy(buffer, message);
+    buffer[len] = '\n';
+    buffer[len + 1] = '\0';
+
+    int sent = send(sock, buffer, len + 1, 0);
+    free(buffer);
+
+    return (sent == len + 1) ? 0 : -1;
+}
+
+// Receive message (one newline-terminated frame from the buffered reader)
+int receive_message(int sock, char *buffer, int size)
+{
+    if (sock <= 0) return -1;
+
+    FrameReader *r = get_reader(sock);
+    if (!r) return -1;
+
+    // Clear buffer
+    memset(buffer, 0, size);
+
+    int result;
+    while (1)
+    {
+        result = pop_frame(r, buffer, size);
+        if (result > 0)
+        {
+            break; // Message complete
+        }
+
+        if (fill_reader(r, -1) <= 0)
+        {
+            // Error, timeout or connection closed: hand out any partial frame
+            result = -1;
+            if (r->len > 0)
+            {
+                size_t copy = r->len < (size_t)(size - 1) ? r->len : (size_t)(size - 1);
+                take_bytes(r, buffer, copy, r->len);
+                buffer[copy] = '\0';
+                result = (int)copy;
+            }
+            break;
+        }
+    }
+
+    put_reader(r);
+    return result;
+}
+
+// Receive every complete frame that is available, in one call.
+// Frames are copied back to back (each ends with '\n') and null-terminated.
+// If no complete frame is buffered, waits up to timeout_ms (< 0: socket
+// timeout) for one; a frame still incomplete then stays buffered.
+// Returns: bytes copied, 0 on timeout, -1 if the connection is closed or broken
+int receive_messages(int sock, char *buffer, int size, int timeout_ms)
+{
+    if (sock <= 0 || size <= 1) return -1;
+
+    FrameReader *r = get_reader(sock);
+    if (!r) return -1;
+
+    int total = 0;
+    buffer[0] = '\0';
+
+    // A fill may bring only part of a frame: keep reading until the deadline
+    long long deadline = (timeout_ms >= 0) ? now_ms() + timeout_ms : 0;
+    int wait_ms = timeout_ms;
+    while (next_frame_length(r) == 0)
+    {
+        int n = fill_reader(r, wait_ms);
+        if (n < 0)
+        {
+            put_reader(r);
+            return -1;
+        }
+        if (n == 0)
+        {
+            break; // Timeout
+        }
+        if (timeout_ms >= 0)
+        {
+            long long left = deadline - now_ms();
+            wait_ms = (left > 0) ? (int)left : 0;
+        }
+    }
+
+    while (1)
+    {
+        size_t frame_len = next_frame_length(r);
+        if (frame_len == 0)
+        {
+            break;
+        }
+
+        // Keep frames whole: stop when the next one does not fit,
+        // unless it is the first one (then it is truncated like receive_message)
+        if (frame_len > (size_t)(size - 1 - total))
+        {
+            if (total > 0)
+            {
+                break;
+            }
+            total = pop_frame(r, buffer, size);
+            break;
+        }
+
+        take_bytes(r, buffer + total, frame_len, frame_len);
+        total += frame_len;
+    }
+
+    buffer[total] = '\0';
+    put_reader(r);
+    return total;
+}
@@ -0,0 +1,86 @@
+"""
+Board Renderer
+Static layer of the game screen (background, squares, grid, labels) cached on a Surface
+"""
+
+import pygame
+
+# Colors of the static layer; set_theme() swaps them and rebuilds
+DEFAULT_THEME = {
+    "background": "dark gray",
+    "light_square": "light gray",
+    "dark_square": "dark gray",
+    "grid": "black",
+    "panel": "gray",
+    "border": "gold",
+    "text": "black",
+}
+
+STATUS_TEXT = ('White: Select a Piece to Move!', 'White: Select a Destination!',
+               'Black: Select a Piece to Move!', 'Black: Select a Destination!')
+
+
+class BoardRenderer:
+    """Pre-renders everything on the game screen that does not change between moves
+
+    One full-screen layer is built per (orientation, status line) the first
+    time it is needed and composited with a single blit afterwards. Layers
+    are rebuilt only when the theme changes.
+    """
+
+    def __init__(self, size, status_font, label_font, theme=None, square_size=100):
+        self.size = size
+        self.status_font = status_font
+        self.label_font = label_font
+        self.theme = dict(theme or DEFAULT_THEME)
+        self.square_size = square_size
+        self._layers = {}
+
+    def set_theme(self, theme):
+        """Use new colors (missing keys keep their defaults); cached layers are dropped"""
+        theme = {**DEFAULT_THEME, **theme}
+        if theme != self.theme:
+            self.theme = theme
+            self._layers.clear()
+
+    def invalidate(self):
+        """Drop cached layers (e.g. after the display mode changed)"""
+        self._layers.clear()
+
+    def draw(self, surface, turn_step=0, orientation='white'):
+        """Blit the static layer for this status line and board orientation"""
+        key = (orientation, turn_step)
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = self._layers[key] = self._build(turn_step, orientation)
+        surface.blit(layer, (0, 0))
+
+    def _build(self, turn_step, orientation):
+        width, height = self.size
+        size = self.square_size
+        board_px = size * 8
+        theme = self.theme
+        layer = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.fill(theme["background"])
+
+        # Squares: a1 (bottom left for White) is dark, so light squares have even x + y
+        for y in range(8):
+            for x in range(8):
+                screen_x, screen_y = (x, y) if orientation == 'white' else (7 - x, 7 - y)
+                color = theme["light_square"] if (x + y) % 2 == 0 else theme["dark_square"]
+                layer.fill(color, (screen_x * size, screen_y * size, size, size))
+
+        pygame.draw.rect(layer, theme["panel"], [0, board_px, width, height - board_px])
+        pygame.draw.rect(layer, theme["border"], [0, board_px, width, height - board_px], 5)
+        pygame.draw.rect(layer, theme["border"], [board_px, 0, width - board_px, height], 5)
+
+        layer.blit(self.status_font.render(STATUS_TEXT[turn_step], True, theme["text"]),
+                   (20, board_px + 20))
+
+        for i in range(9):
+            pygame.draw.line(layer, theme["grid"], (0, size * i), (board_px, size * i), 2)
+            pygame.draw.line(layer, theme["grid"], (size * i, 0), (size * i, board_px), 2)
+        layer.blit(self.label_font.render('FORFEIT', True, theme["text"]), (board_px + 10, board_px + 30))
+        return layer
@@ -1,88 +1,79 @@
-import pygame
-pygame.init()
-
-WIDTH = 1000
-HEIGHT = 900
-screen = pygame.display.set_mode([WIDTH, HEIGHT])
-pygame.display.set_caption('Two-Player Pygame Chess!')
-font = pygame.font.Font('freesansbold.ttf', 20)
-medium_font = pygame.font.Font('freesansbold.ttf', 40)
-big_font = pygame.font.Font('freesansbold.ttf', 50)
-timer = pygame.time.Clock()
-fps = 60
-# game variables and images
-white_pieces = ['rook', 'knight', 'bishop', 'king', 'queen', 'bishop', 'knight', 'rook',
-                'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn']
-white_locations = [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
-                   (0, 1), (1, 1), (2, 1), (3, 1), (4, 1), (5, 1), (6, 1), (7, 1)]
-black_pieces = ['rook', 'knight', 'bishop', 'king', 'queen', 'bishop', 'knight', 'rook',
-                'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn']
-black_locations = [(0, 7), (1, 7), (2, 7), (3, 7), (4, 7), (5, 7), (6, 7), (7, 7),
-                   (0, 6), (1, 6), (2, 6), (3, 6), (4, 6), (5, 6), (6, 6), (7, 6)]
-captured_pieces_white = []
-captured_pieces_black = []
-# 0 - whites turn no selection: 1-whites turn piece selected: 2- black turn no selection, 3 - black turn piece selected
-turn_step = 0
-selection = 100
-valid_moves = []
-# load in game piece images (queen, king, rook, bishop, knight, pawn) x 2
-black_queen = pygame.image.load('assets/images/black queen.png')
-black_queen = pygame.transform.scale(black_queen, (80, 80))
-black_queen_small = pygame.transform.scale(black_queen, (45, 45))
-black_king = pygame.image.load('assets/images/black king.png')
-black_king = pygame.transform.scale(black_king, (80, 80))
-black_king_small = pygame.transform.scale(black_king, (45, 45))
-black_rook = pygame.image.load('assets/images/black rook.png')
-black_rook = pygame.transform.scale(black_rook, (80, 80))
-black_rook_small = pygame.transform.scale(black_rook, (45, 45))
-black_bishop = pygame.image.load('assets/images/black bishop.png')
-black_bishop = pygame.transform.scale(black_bishop, (80, 80))
-black_bishop_small = pygame.transform.scale(black_bishop, (45, 45))
-black_knight = pygame.image.load('assets/images/black knight.png')
-black_knight = pygame.transform.scale(black_knight, (80, 80))
-black_knight_small = pygame.transform.scale(black_knight, (45, 45))
-black_pawn = pygame.image.load('assets/images/black pawn.png')
-black_pawn = pygame.transform.scale(black_pawn, (65, 65))
-black_pawn_small = pygame.transform.scale(black_pawn, (45, 45))
-white_queen = pygame.image.load('assets/images/white queen.png')
-white_queen = pygame.transform.scale(white_queen, (80, 80))
-white_queen_small = pygame.transform.scale(white_queen, (45, 45))
-white_king = pygame.image.load('assets/images/white king.png')
-white_king = pygame.transform.scale(white_king, (80, 80))
-white_king_small = pygame.transform.scale(white_king, (45, 45))
-white_rook = pygame.image.load('assets/images/white rook.png')
-white_rook = pygame.transform.scale(white_rook, (80, 80))
-white_rook_small = pygame.transform.scale(white_rook, (45, 45))
-white_bishop = pygame.image.load('assets/images/white bishop.png')
-white_bishop = pygame.transform.scale(white_bishop, (80, 80))
-white_bishop_small = pygame.transform.scale(white_bishop, (45, 45))
-white_knight = pygame.image.load('assets/images/white knight.png')
-white_knight = pygame.transform.scale(white_knight, (80, 80))
-white_knight_small = pygame.transform.scale(white_knight, (45, 45))
-white_pawn = pygame.image.load('assets/images/white pawn.png')
-white_pawn = pygame.transform.scale(white_pawn, (65, 65))
-white_pawn_small = pygame.transform.scale(white_pawn, (45, 45))
-white_images = [white_pawn, white_queen, white_king, white_knight, white_rook, white_bishop]
-white_promotions = ['bishop', 'knight', 'rook', 'queen']
-white_moved = [False, False, False, False, False, False, False, False,
-               False, False, False, False, False, False, False, False]
-small_white_images = [white_pawn_small, white_queen_small, white_king_small, white_knight_small,
-                      white_rook_small, white_bishop_small]
-black_images = [black_pawn, black_queen, black_king, black_knight, black_rook, black_bishop]
-small_black_images = [black_pawn_small, black_queen_small, black_king_small, black_knight_small,
-                      black_rook_small, black_bishop_small]
-black_promotions = ['bishop', 'knight', 'rook', 'queen']
-black_moved = [False, False, False, False, False, False, False, False,
-               False, False, False, False, False, False, False, False]
-piece_list = ['pawn', 'queen', 'king', 'knight', 'rook', 'bishop']
-# check variables/ flashing counter
-counter = 0
-winner = ''
-game_over = False
-white_ep = (100, 100)
-black_ep = (100, 100)
-white_promote = False
-black_promote = False
-promo_index = 100
-check = False
+import pygame
+from sprites import SpriteAtlas, PIECE_SIZE, PAWN_SIZE, CAPTURED_SIZE
+pygame.init()
+
+WIDTH = 1000
+HEIGHT = 900
+screen = pygame.display.set_mode([WIDTH, HEIGHT])
+pygame.display.set_caption('Two-Player Pygame Chess!')
+font = pygame.font.Font('freesansbold.ttf', 20)
+medium_font = pygame.font.Font('freesansbold.ttf', 40)
+big_font = pygame.font.Font('freesansbold.ttf', 50)
+timer = pygame.time.Clock()
+fps = 60
+# game variables and images
+white_pieces = ['rook', 'knight', 'bishop', 'king', 'queen', 'bishop', 'knight', 'rook',
+                'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn']
+white_locations = [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
+                   (0, 1), (1, 1), (2, 1), (3, 1), (4, 1), (5, 1), (6, 1), (7, 1)]
+black_pieces = ['rook', 'knight', 'bishop', 'king', 'queen', 'bishop', 'knight', 'rook',
+                'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn', 'pawn']
+black_locations = [(0, 7), (1, 7), (2, 7), (3, 7), (4, 7), (5, 7), (6, 7), (7, 7),
+                   (0, 6), (1, 6), (2, 6), (3, 6), (4, 6), (5, 6), (6, 6), (7, 6)]
+captured_pieces_white = []
+captured_pieces_black = []
+# 0 - whites turn no selection: 1-whites turn piece selected: 2- black turn no selection, 3 - black turn piece selected
+turn_step = 0
+selection = 100
+valid_moves = []
+# load in game piece images (queen, king, rook, bishop, knight, pawn) x 2
+piece_sprites = SpriteAtlas()
+piece_sprites.preload((PIECE_SIZE, PAWN_SIZE, CAPTURED_SIZE))
+black_queen = piece_sprites.image('black', 'queen', PIECE_SIZE)
+black_queen_small = piece_sprites.image('black', 'queen', CAPTURED_SIZE)
+black_king = piece_sprites.image('black', 'king', PIECE_SIZE)
+black_king_small = piece_sprites.image('black', 'king', CAPTURED_SIZE)
+black_rook = piece_sprites.image('black', 'rook', PIECE_SIZE)
+black_rook_small = piece_sprites.image('black', 'rook', CAPTURED_SIZE)
+black_bishop = piece_sprites.image('black', 'bishop', PIECE_SIZE)
+black_bishop_small = piece_sprites.image('black', 'bishop', CAPTURED_SIZE)
+black_knight = piece_sprites.image('black', 'knight', PIECE_SIZE)
+black_knight_small = piece_sprites.image('black', 'knight', CAPTURED_SIZE)
+black_pawn = piece_sprites.image('black', 'pawn', PAWN_SIZE)
+black_pawn_small = piece_sprites.image('black', 'pawn', CAPTURED_SIZE)
+white_queen = piece_sprites.image('white', 'queen', PIECE_SIZE)
+white_queen_small = piece_sprites.image('white', 'queen', CAPTURED_SIZE)
+white_king = piece_sprites.image('white', 'king', PIECE_SIZE)
+white_king_small = piece_sprites.image('white', 'king', CAPTURED_SIZE)
+white_rook = piece_sprites.image('white', 'rook', PIECE_SIZE)
+white_rook_small = piece_sprites.image('white', 'rook', CAPTURED_SIZE)
+white_bishop = piece_sprites.image('white', 'bishop', PIECE_SIZE)
+white_bishop_small = piece_sprites.image('white', 'bishop', CAPTURED_SIZE)
+white_knight = piece_sprites.image('white', 'knight', PIECE_SIZE)
+white_knight_small = piece_sprites.image('white', 'knight', CAPTURED_SIZE)
+white_pawn = piece_sprites.image('white', 'pawn', PAWN_SIZE)
+white_pawn_small = piece_sprites.image('white', 'pawn', CAPTURED_SIZE)
+white_images = [white_pawn, white_queen, white_king, white_knight, white_rook, white_bishop]
+white_promotions = ['bishop', 'knight', 'rook', 'queen']
+white_moved = [False, False, False, False, False, False, False, False,
+               False, False, False, False, False, False, False, False]
+small_white_images = [white_pawn_small, white_queen_small, white_king_small, white_knight_small,
+                      white_rook_small, white_bishop_small]
+black_images = [black_pawn, black_queen, black_king, black_knight, black_rook, black_bishop]
+small_black_images = [black_pawn_small, black_queen_small, black_king_small, black_knight_small,
+                      black_rook_small, black_bishop_small]
+black_promotions = ['bishop', 'knight', 'rook', 'queen']
+black_moved = [False, False, False, False, False, False, False, False,
+               False, False, False, False, False, False, False, False]
+piece_list = ['pawn', 'queen', 'king', 'knight', 'rook', 'bishop']
+# check variables/ flashing counter
+counter = 0
+winner = ''
+game_over = False
+white_ep = (100, 100)
+black_ep = (100, 100)
+white_promote = False
+black_promote = False
+promo_index = 100
+check = False
 castling_moves = []
\ No newline at end of file
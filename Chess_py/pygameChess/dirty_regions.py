@@ -0,0 +1,96 @@
+"""
+Dirty Regions
+Tracks which parts of the window changed so only those are sent to the display
+"""
+
+import pygame
+from config import RENDER_DIRTY_RECTS, DIRTY_RECTS_MAX
+
+
+class DirtyRegions:
+    """Changed screen areas of the current frame, found by comparing region keys with the last frame
+
+    Before drawing, the caller names each part of the screen it paints with
+    its rect and a key describing what is shown there (text, selection,
+    hovered button...). A region whose key or rect differs from the last
+    frame is dirty where it was and where it is now. When nothing is dirty
+    the frame does not need to be drawn at all; otherwise present() sends
+    only the dirty rects with pygame.display.update().
+
+    The whole window is flipped on the first frame of a scene (state
+    transitions), after mark_all(), when more than max_rects rects piled
+    up, or always when the mode is off.
+    """
+
+    def __init__(self, size, enabled=RENDER_DIRTY_RECTS, max_rects=DIRTY_RECTS_MAX):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.enabled = enabled
+        self.max_rects = max_rects
+        self._scene = None
+        self._regions = {}  # name -> (rect, key) as last drawn
+        self._dirty = []
+        self._full = True
+
+    def begin(self, scene):
+        """Start a frame of scene; the first frame after a scene change repaints everything"""
+        if scene != self._scene:
+            self._scene = scene
+            self._regions.clear()
+            self._full = True
+
+    def region(self, name, rect, key=None):
+        """Declare a painted area; returns True (and marks it) when it differs from the last frame"""
+        last = self._regions.get(name)
+        if last is not None and last[1] == key and last[0] == rect:
+            return False
+        rect = pygame.Rect(rect)
+        if last is not None:
+            self._dirty.append(last[0])
+        self._dirty.append(rect)
+        self._regions[name] = (rect, key)
+        return True
+
+    def regions(self, items):
+        """region() for each (name, rect, key) of a view's regions()"""
+        for name, rect, key in items:
+            self.region(name, rect, key)
+
+    def mark(self, rect):
+        """Send rect this frame whatever the region keys say"""
+        self._dirty.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        """Flip the whole window this frame (animated overlays, expose events)"""
+        self._full = True
+
+    @property
+    def needs_redraw(self):
+        """False when the window already shows this frame and drawing can be skipped"""
+        return self._full or bool(self._dirty) or not self.enabled
+
+    def present(self):
+        """Send this frame's changes to the display and start collecting the next frame"""
+        if not self.enabled or self._full:
+            pygame.display.flip()
+        elif self._dirty:
+            rects = self._merge(self._dirty)
+            if len(rects) > self.max_rects:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        self._dirty = []
+        self._full = False
+
+    def _merge(self, rects):
+        """Clip to the window and join overlapping rects"""
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -0,0 +1,27 @@
+"""
+Fonts
+Process-wide font registry so each TTF is parsed once per size
+"""
+
+import pygame
+from config import FONT_NAME
+
+_fonts = {}  # (name, size) -> pygame.font.Font
+
+
+def get_font(size, name=FONT_NAME):
+    """Shared Font for (name, size), loaded on first use
+
+    Every caller gets the same object, so do not change its style
+    (set_bold, set_underline...) in place.
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+
+def clear_fonts():
+    """Forget loaded fonts (needed after pygame.font.quit(), which invalidates them)"""
+    _fonts.clear()
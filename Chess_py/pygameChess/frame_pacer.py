@@ -0,0 +1,68 @@
+"""
+Frame Pacer
+Runs the main loop at full rate while the screen changes and sleeps on the event queue when idle
+"""
+
+import pygame
+from config import FPS_ACTIVE, FPS_IDLE, FPS_IDLE_AFTER
+
+
+class FramePacer:
+    """Drop-in for clock.tick(fps) that slows down when nothing happens
+
+    The loop calls activity() whenever a frame had something to show
+    (a redraw, a running animation). While the last activity is recent,
+    tick() limits the loop to active_fps like pygame.time.Clock. After
+    idle_after seconds without activity it blocks in pygame.event.wait()
+    until the next idle_fps frame is due. Any event (input, window events,
+    the async handler's MESSAGE_EVENT) ends the wait at once and counts as
+    activity. wait() has taken that event off the queue, so it is kept
+    and events() hands it out ahead of the events queued after it.
+    """
+
+    def __init__(self, active_fps=FPS_ACTIVE, idle_fps=FPS_IDLE, idle_after=FPS_IDLE_AFTER):
+        self.clock = pygame.time.Clock()
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after_ms = int(idle_after * 1000)
+        self._last_activity = pygame.time.get_ticks()
+        self._last_frame = self._last_activity
+        self._woken_by = None  # Event that ended the idle wait, not handled yet
+
+    def activity(self):
+        """Something changed this frame: keep running at active_fps"""
+        self._last_activity = pygame.time.get_ticks()
+
+    @property
+    def idle(self):
+        """True once nothing has happened for idle_after seconds"""
+        return pygame.time.get_ticks() - self._last_activity >= self.idle_after_ms
+
+    def tick(self):
+        """Wait for the next frame; returns the milliseconds since the last one"""
+        if self._woken_by is not None or pygame.event.peek():
+            self.activity()
+        if self.idle_fps < self.active_fps and self.idle:
+            remaining = 1000 // self.idle_fps - (pygame.time.get_ticks() - self._last_frame)
+            if remaining > 0:
+                event = pygame.event.wait(remaining)
+                if event.type != pygame.NOEVENT:
+                    self._woken_by = event
+                    self.activity()
+            dt_ms = self.clock.tick()
+        else:
+            dt_ms = self.clock.tick(self.active_fps)
+        self._last_frame = pygame.time.get_ticks()
+        return dt_ms
+
+    def events(self):
+        """pygame.event.get(), preceded by the event that ended the last idle wait"""
+        events = pygame.event.get()
+        if self._woken_by is not None:
+            events.insert(0, self._woken_by)
+            self._woken_by = None
+        return events
+
+    def get_fps(self):
+        """Average frame rate over the last frames"""
+        return self.clock.get_fps()
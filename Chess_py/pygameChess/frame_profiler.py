@@ -0,0 +1,171 @@
+"""
+Frame Profiler
+Per-stage frame timings for the main loop, shown as an overlay and saved as CSV
+"""
+
+import csv
+import os
+import time
+from collections import deque
+import pygame
+from config import *
+from fonts import get_font
+from text_cache import render_text
+from logger import get_logger
+
+log = get_logger("profiler")
+
+# CHESS_PROFILE=1 shows the overlay at start, CHESS_PROFILE_TRACE=file.csv streams every frame
+ENV_VAR = "CHESS_PROFILE"
+TRACE_ENV_VAR = "CHESS_PROFILE_TRACE"
+
+# Stages of the main loop, in the order they are listed
+STAGES = ("wait", "events", "network", "board", "pieces", "draw", "hud", "present")
+
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+
+
+class FrameProfiler:
+    """Times the stages of each main loop frame
+
+    The loop calls start_frame() at the top and lap(stage) after each stage;
+    a lap is the time since the previous lap, so stages need no nesting and
+    a stage that runs twice in a frame is added up. While disabled both
+    return at once.
+
+    The last `history` frames are kept as (start, {stage: seconds}). The
+    overlay shows their average frame time, the p50 / p99 of the busy time
+    (everything but "wait", the frame pacer's sleep) and the average of
+    each stage. It is refreshed every `refresh` seconds so it stays readable.
+    """
+
+    def __init__(self, enabled=PROFILER_ENABLED, history=PROFILER_HISTORY,
+                 refresh=PROFILER_REFRESH, trace_file=PROFILER_TRACE_FILE):
+        self.enabled = enabled or os.environ.get(ENV_VAR, "") not in ("", "0")
+        self.frames = deque(maxlen=history)
+        self.refresh = refresh
+        self.font = get_font(FONT_SIZE_SMALL)
+        self._frame_start = None
+        self._last = 0.0
+        self._stages = {}
+        self._lines = []
+        self._lines_time = 0.0
+        self._trace = None
+        self._trace_writer = None
+        trace_file = os.environ.get(TRACE_ENV_VAR) or trace_file
+        if trace_file:
+            self._open_trace(trace_file)
+            self.enabled = True
+
+    def handle_event(self, event):
+        """F3 shows / hides the overlay, F4 saves the recent frames"""
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == TOGGLE_KEY:
+            self.enabled = not self.enabled
+            self.frames.clear()
+            self._frame_start = None
+            self._lines = []
+        elif event.key == DUMP_KEY and self.frames:
+            self.dump_csv(time.strftime("frame_trace_%Y%m%d_%H%M%S.csv"))
+
+    def start_frame(self):
+        """Close the previous frame and start timing a new one"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._stages["total"] = now - self._frame_start
+            self.frames.append((self._frame_start, self._stages))
+            if self._trace_writer:
+                self._trace_writer.writerow(self._row(self._frame_start, self._stages))
+        self._frame_start = self._last = now
+        self._stages = {}
+
+    def lap(self, stage):
+        """Charge the time since the previous lap to stage"""
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter()
+        self._stages[stage] = self._stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def region(self):
+        """(rect, key) of the overlay; the key changes when its text does"""
+        now = time.perf_counter()
+        if now - self._lines_time >= self.refresh:
+            self._lines = self._summary()
+            self._lines_time = now
+        line_height = self.font.get_linesize()
+        width = max((self.font.size(line)[0] for line in self._lines), default=0)
+        rect = pygame.Rect(8, 8, width + 2 * SPACING_SMALL, len(self._lines) * line_height + 2 * SPACING_SMALL)
+        return rect, tuple(self._lines)
+
+    def draw(self, surface):
+        """Draw the overlay (opaque, so drawing it again over itself is harmless)"""
+        rect, lines = self.region()
+        if not lines:
+            return
+        pygame.draw.rect(surface, COLOR_BACKGROUND_PRIMARY, rect)
+        pygame.draw.rect(surface, COLOR_ACCENT_PRIMARY, rect, 1)
+        y = rect.y + SPACING_SMALL
+        for line in lines:
+            surface.blit(render_text(self.font, line, COLOR_TEXT), (rect.x + SPACING_SMALL, y))
+            y += self.font.get_linesize()
+
+    def _summary(self):
+        """Overlay text for the frames in the history"""
+        if not self.frames:
+            return []
+        count = len(self.frames)
+        totals = [stages["total"] for _, stages in self.frames]
+        busy = sorted(stages["total"] - stages.get("wait", 0.0) for _, stages in self.frames)
+        frame_ms = sum(totals) / count * 1000
+        lines = [
+            f"frame {frame_ms:.1f} ms ({1000 / frame_ms if frame_ms else 0:.0f} fps)",
+            f"busy p50 {busy[count // 2] * 1000:.2f} ms  p99 {busy[min(count - 1, int(count * 0.99))] * 1000:.2f} ms",
+        ]
+        for stage in STAGES:
+            spent = sum(stages.get(stage, 0.0) for _, stages in self.frames)
+            if spent:
+                lines.append(f"{stage:<8} {spent / count * 1000:7.2f} ms")
+        return lines
+
+    def _row(self, start, stages):
+        """CSV row: start time, total and each stage in milliseconds"""
+        return [f"{start:.6f}", f"{stages['total'] * 1000:.3f}"] + \
+            [f"{stages.get(stage, 0.0) * 1000:.3f}" for stage in STAGES]
+
+    def _header(self):
+        return ["start", "total_ms"] + [f"{stage}_ms" for stage in STAGES]
+
+    def _open_trace(self, path):
+        """Write every frame to path from now on"""
+        try:
+            self._trace = open(path, "w", newline="")
+        except OSError as e:
+            log.warning("Cannot open frame trace %s: %s", path, e)
+            return
+        self._trace_writer = csv.writer(self._trace)
+        self._trace_writer.writerow(self._header())
+        log.info("Writing frame trace to %s", path)
+
+    def dump_csv(self, path):
+        """Save the frames in the history to path"""
+        try:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(self._header())
+                for start, stages in self.frames:
+                    writer.writerow(self._row(start, stages))
+        except OSError as e:
+            log.warning("Cannot write frame trace %s: %s", path, e)
+            return
+        log.info("Saved %d frames to %s", len(self.frames), path)
+
+    def close(self):
+        """Close the streamed trace file"""
+        if self._trace:
+            self._trace.close()
+            self._trace = self._trace_writer = None
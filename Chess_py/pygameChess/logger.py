@@ -0,0 +1,184 @@
+"""
+Logging Setup
+Leveled logging for the chess client with an in-memory ring buffer
+"""
+
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from config import LOG_LEVEL, LOG_MODULE_LEVELS, LOG_RING_BUFFER_SIZE, LOG_RING_BUFFER_LEVEL
+
+# Every client logger lives under this name so setup never touches the root logger
+ROOT_NAME = "chess"
+
+# Overrides config at run time, e.g. CHESS_LOG="WARNING,network=DEBUG"
+ENV_VAR = "CHESS_LOG"
+
+LOG_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)-7s [%(name)s] %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+
+_ring_handler = None
+_setup_lock = threading.Lock()
+
+
+def get_logger(name):
+    """Logger for one client module ("network", "main", ...)"""
+    return logging.getLogger(f"{ROOT_NAME}.{name}")
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last records in memory and dumps them when an error is logged
+
+    Records are stored unformatted; the message is only built if a dump
+    actually happens.
+    """
+
+    def __init__(self, capacity, stream=None):
+        super().__init__(logging.DEBUG)
+        self.records = deque(maxlen=capacity)
+        self.stream = stream
+
+    def emit(self, record):
+        self.records.append(record)
+        if record.levelno >= logging.ERROR:
+            self.dump(f"{record.levelname} in {record.name}")
+
+    def dump(self, reason="requested"):
+        """Write the buffered records to the stream and clear the buffer"""
+        stream = self.stream or sys.stderr
+        self.acquire()
+        try:
+            records = list(self.records)
+            self.records.clear()
+        finally:
+            self.release()
+
+        stream.write(f"---- last {len(records)} log records ({reason}) ----\n")
+        for record in records:
+            try:
+                stream.write(self.format(record) + "\n")
+            except Exception:
+                self.handleError(record)
+        stream.write("---- end of log records ----\n")
+        stream.flush()
+
+
+def _parse_levels(spec):
+    """Parse "LEVEL,module=LEVEL,..." into (default level or None, {module: level})"""
+    default = None
+    modules = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            name, level = part.split("=", 1)
+            modules[name.strip()] = level.strip().upper()
+        else:
+            default = part.upper()
+    return default, modules
+
+
+def _resolve_level(level, setting, problems):
+    """Numeric level for a name like "DEBUG"; INFO (noted in problems) if it is unknown"""
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(str(level).strip().upper())
+    if isinstance(number, int):
+        return number
+    problems.append(f"Unknown log level {level!r} in {setting}, using INFO")
+    return logging.INFO
+
+
+def setup_logging():
+    """Configure client logging from config.py and the CHESS_LOG variable
+
+    Console output is filtered by LOG_LEVEL / LOG_MODULE_LEVELS. When the
+    ring buffer is enabled it records from LOG_RING_BUFFER_LEVEL up and is
+    dumped to stderr on any ERROR record or uncaught exception. An unknown
+    level name falls back to INFO with a warning. Safe to call more than once.
+    """
+    global _ring_handler
+
+    with _setup_lock:
+        if _ring_handler is not None or logging.getLogger(ROOT_NAME).handlers:
+            return
+
+        problems = []
+        console_level = _resolve_level(LOG_LEVEL, "LOG_LEVEL", problems)
+        ring_level = _resolve_level(LOG_RING_BUFFER_LEVEL, "LOG_RING_BUFFER_LEVEL", problems)
+        module_levels = {name: _resolve_level(level, f"LOG_MODULE_LEVELS[{name!r}]", problems)
+                         for name, level in LOG_MODULE_LEVELS.items()}
+        env_default, env_modules = _parse_levels(os.environ.get(ENV_VAR, ""))
+        if env_default:
+            console_level = _resolve_level(env_default, ENV_VAR, problems)
+        for name, level in env_modules.items():
+            module_levels[name] = _resolve_level(level, ENV_VAR, problems)
+
+        formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+        root = logging.getLogger(ROOT_NAME)
+        root.propagate = False
+
+        # Console: LOG_LEVEL, or the module's own level when it has one
+        console = logging.StreamHandler()
+        console.setFormatter(formatter)
+        console.addFilter(_ModuleLevelFilter(console_level, module_levels))
+        root.addHandler(console)
+
+        # Loggers only build records some handler can use, so disabled
+        # levels cost one isEnabledFor() check
+        threshold = console_level
+        if LOG_RING_BUFFER_SIZE > 0:
+            _ring_handler = RingBufferHandler(LOG_RING_BUFFER_SIZE)
+            _ring_handler.setFormatter(formatter)
+            _ring_handler.setLevel(ring_level)
+            root.addHandler(_ring_handler)
+            threshold = min(threshold, ring_level)
+        root.setLevel(threshold)
+
+        for name, level in module_levels.items():
+            get_logger(name).setLevel(level)
+
+        _install_excepthooks()
+
+    for problem in problems:
+        get_logger("logger").warning(problem)
+
+
+class _ModuleLevelFilter(logging.Filter):
+    """Console filter: per-module levels, LOG_LEVEL for everything else"""
+
+    def __init__(self, default_level, module_levels):
+        super().__init__()
+        self.default_level = default_level
+        self.levels = {f"{ROOT_NAME}.{name}": level for name, level in module_levels.items()}
+
+    def filter(self, record):
+        return record.levelno >= self.levels.get(record.name, self.default_level)
+
+
+def _install_excepthooks():
+    """Log uncaught exceptions (main and worker threads) so the buffer is dumped"""
+    log = get_logger("main")
+    previous_hook = sys.excepthook
+
+    def excepthook(exc_type, exc, tb):
+        if issubclass(exc_type, KeyboardInterrupt):
+            previous_hook(exc_type, exc, tb)
+            return
+        log.critical("Uncaught exception", exc_info=(exc_type, exc, tb))
+
+    def thread_excepthook(args):
+        log.critical("Uncaught exception in thread %s", args.thread.name if args.thread else "?",
+                     exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+
+def dump_ring_buffer(reason="requested"):
+    """Write the buffered records to stderr now"""
+    if _ring_handler is not None:
+        _ring_handler.dump(reason)
@@ -0,0 +1,236 @@
+"""
+Move Generation
+Legal chess moves for a Position (check, pins, castling, en passant, promotion)
+"""
+
+from position import (WHITE, BLACK, EMPTY, CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ,
+                      Move, coords, square, iter_squares)
+
+PROMOTION_PIECES = ('q', 'r', 'b', 'n')
+
+KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_STEPS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+BISHOP_DIRS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+ROOK_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def _build_jumps(steps):
+    """Target squares of a fixed-step piece from every square"""
+    table = []
+    for sq in range(64):
+        x, y = coords(sq)
+        table.append(tuple(square(x + dx, y + dy) for dx, dy in steps
+                           if 0 <= x + dx < 8 and 0 <= y + dy < 8))
+    return table
+
+
+def _build_rays(directions):
+    """Squares along each direction from every square, nearest first"""
+    table = []
+    for sq in range(64):
+        x, y = coords(sq)
+        rays = []
+        for dx, dy in directions:
+            ray = []
+            cx, cy = x + dx, y + dy
+            while 0 <= cx < 8 and 0 <= cy < 8:
+                ray.append(square(cx, cy))
+                cx += dx
+                cy += dy
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return table
+
+
+KNIGHT_TARGETS = _build_jumps(KNIGHT_STEPS)
+KING_TARGETS = _build_jumps(KING_STEPS)
+BISHOP_RAYS = _build_rays(BISHOP_DIRS)
+ROOK_RAYS = _build_rays(ROOK_DIRS)
+QUEEN_RAYS = [b + r for b, r in zip(BISHOP_RAYS, ROOK_RAYS)]
+
+
+def _mask(squares):
+    bits = 0
+    for sq in squares:
+        bits |= 1 << sq
+    return bits
+
+
+# Same tables as bitmasks, for testing against the position's bitboards
+KNIGHT_MASKS = [_mask(targets) for targets in KNIGHT_TARGETS]
+KING_MASKS = [_mask(targets) for targets in KING_TARGETS]
+BISHOP_LINES = [_mask(sq for ray in rays for sq in ray) for rays in BISHOP_RAYS]
+ROOK_LINES = [_mask(sq for ray in rays for sq in ray) for rays in ROOK_RAYS]
+# PAWN_ATTACKERS[color][sq]: squares a pawn of color attacks sq from
+PAWN_ATTACKERS = (
+    [_mask(square(x + dx, y + 1) for dx in (-1, 1) if 0 <= x + dx < 8 and y < 7)
+     for x, y in map(coords, range(64))],
+    [_mask(square(x + dx, y - 1) for dx in (-1, 1) if 0 <= x + dx < 8 and y > 0)
+     for x, y in map(coords, range(64))],
+)
+
+
+def is_attacked(position, sq, by_color):
+    """True if any piece of by_color attacks square sq"""
+    bitboards = position.bitboards
+    pawn, knight, bishop, rook, queen, king = 'pnbrqk' if by_color == WHITE else 'PNBRQK'
+
+    if (PAWN_ATTACKERS[by_color][sq] & bitboards[pawn] or
+            KNIGHT_MASKS[sq] & bitboards[knight] or KING_MASKS[sq] & bitboards[king]):
+        return True
+
+    # Sliders: only walk the rays when one of them is on a line through sq
+    board = position.board
+    queens = bitboards[queen]
+    if BISHOP_LINES[sq] & (bitboards[bishop] | queens):
+        for ray in BISHOP_RAYS[sq]:
+            for target in ray:
+                piece = board[target]
+                if piece != EMPTY:
+                    if piece == bishop or piece == queen:
+                        return True
+                    break
+    if ROOK_LINES[sq] & (bitboards[rook] | queens):
+        for ray in ROOK_RAYS[sq]:
+            for target in ray:
+                piece = board[target]
+                if piece != EMPTY:
+                    if piece == rook or piece == queen:
+                        return True
+                    break
+    return False
+
+
+def in_check(position, color):
+    """True if color's king is attacked"""
+    king_sq = position.king_square(color)
+    return king_sq >= 0 and is_attacked(position, king_sq, color ^ 1)
+
+
+def _own(piece, white):
+    return piece != EMPTY and piece.islower() == white
+
+
+def _enemy(piece, white):
+    return piece != EMPTY and piece.islower() != white
+
+
+def _pseudo_moves(position, src, moves):
+    """Append the moves of the piece on src, ignoring checks on its own king"""
+    board = position.board
+    piece = board[src]
+    white = piece.islower()
+    kind = piece.lower()
+
+    if kind == 'p':
+        x, y = coords(src)
+        step = -8 if white else 8
+        start_row, last_row = (6, 0) if white else (1, 7)
+        one = src + step
+        targets = []
+        if board[one] == EMPTY:
+            targets.append(one)
+            if y == start_row and board[one + step] == EMPTY:
+                moves.append(Move(src, one + step))
+        for dx in (-1, 1):
+            if 0 <= x + dx < 8:
+                target = one + dx
+                if _enemy(board[target], white) or target == position.ep_square:
+                    targets.append(target)
+        for target in targets:
+            if target // 8 == last_row:
+                moves.extend(Move(src, target, promo) for promo in PROMOTION_PIECES)
+            else:
+                moves.append(Move(src, target))
+
+    elif kind == 'n' or kind == 'k':
+        for target in (KNIGHT_TARGETS if kind == 'n' else KING_TARGETS)[src]:
+            if not _own(board[target], white):
+                moves.append(Move(src, target))
+        if kind == 'k':
+            _castling_moves(position, src, white, moves)
+
+    else:
+        rays = BISHOP_RAYS if kind == 'b' else ROOK_RAYS if kind == 'r' else QUEEN_RAYS
+        for ray in rays[src]:
+            for target in ray:
+                occupant = board[target]
+                if occupant == EMPTY:
+                    moves.append(Move(src, target))
+                    continue
+                if occupant.islower() != white:
+                    moves.append(Move(src, target))
+                break
+
+
+def _castling_moves(position, src, white, moves):
+    """Append castling moves; the king may not start, pass or land in check"""
+    board = position.board
+    home, king_side, queen_side = (60, CASTLE_WK, CASTLE_WQ) if white else (4, CASTLE_BK, CASTLE_BQ)
+    if src != home or not position.castling & (king_side | queen_side):
+        return
+
+    rook = 'r' if white else 'R'
+    enemy = BLACK if white else WHITE
+    if is_attacked(position, home, enemy):
+        return
+
+    if (position.castling & king_side and board[home + 3] == rook and
+            board[home + 1] == EMPTY and board[home + 2] == EMPTY and
+            not is_attacked(position, home + 1, enemy) and
+            not is_attacked(position, home + 2, enemy)):
+        moves.append(Move(home, home + 2))
+
+    if (position.castling & queen_side and board[home - 4] == rook and
+            board[home - 1] == EMPTY and board[home - 2] == EMPTY and board[home - 3] == EMPTY and
+            not is_attacked(position, home - 1, enemy) and
+            not is_attacked(position, home - 2, enemy)):
+        moves.append(Move(home, home - 2))
+
+
+def _is_legal(position, move, color):
+    """True if move does not leave color's king attacked"""
+    undo = position.make_move(move)
+    legal = not in_check(position, color)
+    position.unmake_move(move, undo)
+    return legal
+
+
+def legal_moves(position):
+    """All legal moves for the side to move"""
+    color = position.side
+    moves = []
+    for src in iter_squares(position.occupancy[color]):
+        _pseudo_moves(position, src, moves)
+    return [move for move in moves if _is_legal(position, move, color)]
+
+
+def legal_moves_from(position, src):
+    """Legal moves of the piece on src (it must belong to the side to move)"""
+    if not position.occupancy[position.side] >> src & 1:
+        return []
+    moves = []
+    _pseudo_moves(position, src, moves)
+    return [move for move in moves if _is_legal(position, move, position.side)]
+
+
+def legal_destinations(position, x, y):
+    """Board coordinates the piece on (x, y) can move to (promotions counted once)"""
+    targets = []
+    for move in legal_moves_from(position, square(x, y)):
+        target = coords(move.dst)
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def has_legal_moves(position):
+    """True if the side to move has at least one legal move"""
+    color = position.side
+    for src in iter_squares(position.occupancy[color]):
+        moves = []
+        _pseudo_moves(position, src, moves)
+        if any(_is_legal(position, move, color) for move in moves):
+            return True
+    return False
@@ -1,268 +1,298 @@
-import ctypes
-import json
-import threading
-import time
-import os
-from config import SERVER_HOST, SERVER_PORT
-
-# Session file path
-SESSION_FILE = os.path.expanduser("~/.chess_session.json")
-
-# Load C library
-try:
-    # Assuming library is in ../network_lib/client_network.so relative to this file
-    _lib_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                            "network_lib", "client_network.so")
-    _clib = ctypes.CDLL(_lib_path)
-    
-    # Define argument/return types
-    _clib.connect_to_server.argtypes = [ctypes.c_char_p, ctypes.c_int]
-    _clib.connect_to_server.restype = ctypes.c_int
-    
-    _clib.disconnect_server.argtypes = [ctypes.c_int]
-    
-    _clib.send_message.argtypes = [ctypes.c_int, ctypes.c_char_p]
-    _clib.send_message.restype = ctypes.c_int
-    
-    _clib.receive_message.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
-    _clib.receive_message.restype = ctypes.c_int
-    
-    _clib.check_connection.argtypes = [ctypes.c_int]
-    _clib.check_connection.restype = ctypes.c_int
-    
-except OSError:
-    print(f"Error: Could not load C library at {_lib_path}")
-    _clib = None
-
-
-class NetworkClient:
-    """Client for communicating with C Server using C shared library"""
-    
-    def __init__(self, host=SERVER_HOST, port=SERVER_PORT):
-        self.host = host
-        self.port = port
-        self.socket_fd = 0
-        self.connected = False
-        self.lock = threading.Lock()
-        self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 5
-        
-        # Session tracking for reconnect
-        self.last_session_id = None
-        self.last_username = None
-        
-        # Load persisted session from file
-        self._load_session_from_file()
-        
-        if not _clib:
-            print("[Network] FATAL: C library not loaded")
-    
-    def _load_session_from_file(self):
-        """Load saved session from file for reconnect after restart"""
-        try:
-            if os.path.exists(SESSION_FILE):
-                with open(SESSION_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.last_session_id = data.get('session_id')
-                    self.last_username = data.get('username')
-                    print(f"[Network] Loaded saved session: {self.last_username}")
-        except Exception as e:
-            print(f"[Network] Could not load session: {e}")
-    
-    def _save_session_to_file(self):
-        """Save session to file for reconnect after restart"""
-        try:
-            with open(SESSION_FILE, 'w') as f:
-                json.dump({
-                    'session_id': self.last_session_id,
-                    'username': self.last_username
-                }, f)
-            print(f"[Network] Session saved to file")
-        except Exception as e:
-            print(f"[Network] Could not save session: {e}")
-    
-    def _clear_session_file(self):
-        """Clear session file on logout"""
-        try:
-            if os.path.exists(SESSION_FILE):
-                os.remove(SESSION_FILE)
-                print("[Network] Session file cleared")
-        except:
-            pass
-    
-    def has_saved_session(self):
-        """Check if there's a saved session to try reconnecting"""
-        return self.last_session_id is not None and self.last_username is not None
-        
-    def connect(self):
-        """Establish connection to the server via C library"""
-        if not _clib: return False
-        
-        try:
-            host_bytes = self.host.encode('utf-8')
-            fd = _clib.connect_to_server(host_bytes, self.port)
-            
-            if fd > 0:
-                self.socket_fd = fd
-                self.connected = True
-                self.reconnect_attempts = 0
-                print(f"[Network] Connected to server at {self.host}:{self.port} (FD: {fd})")
-                return True
-            else:
-                print(f"[Network] Connection failed with code: {fd}")
-                self.connected = False
-                return False
-                
-        except Exception as e:
-            print(f"[Network] Connection exception: {e}")
-            self.connected = False
-            return False
-    
-    def disconnect(self):
-        """Close connection via C library"""
-        with self.lock:
-            if self.socket_fd > 0:
-                try:
-                    _clib.disconnect_server(self.socket_fd)
-                except Exception as e:
-                    print(f"[Network] Error during disconnect: {e}")
-                self.socket_fd = 0
-            self.connected = False
-            self.reconnect_attempts = 0
-            print("[Network] Disconnected from server")
-    
-    def reconnect(self):
-        """Attempt to reconnect to the server"""
-        if self.reconnect_attempts >= self.max_reconnect_attempts:
-            print("[Network] Max reconnection attempts reached")
-            return False
-        
-        print(f"[Network] Reconnecting... (attempt {self.reconnect_attempts + 1})")
-        
-        # Ensure old socket is fully closed
-        if self.socket_fd > 0:
-            try:
-                _clib.disconnect_server(self.socket_fd)
-            except:
-                pass
-            self.socket_fd = 0
-        
-        self.connected = False
-        time.sleep(1)  # Wait before reconnecting
-        self.reconnect_attempts += 1
-        return self.connect()
-    
-    def reconnect_with_session(self):
-        """Reconnect và restore session bằng sessionId đã lưu"""
-        if not self.last_session_id or not self.last_username:
-            print("[Network] No saved session to restore")
-            return False
-        
-        if not self.reconnect():
-            return False
-        
-        # Gửi RECONNECT request thay vì LOGIN
-        print(f"[Network] Attempting to restore session for {self.last_username}")
-        return self.send_message("RECONNECT", {
-            "sessionId": self.last_session_id,
-            "username": self.last_username
-        })
-    
-    def save_session(self, session_id, username):
-        """Lưu session để có thể reconnect sau này"""
-        self.last_session_id = session_id
-        self.last_username = username
-        self._save_session_to_file()  # Persist to file
-        print(f"[Network] Session saved: {username} ({session_id[:8]}...)")
-    
-    def clear_session(self):
-        """Clear session on logout"""
-        self.last_session_id = None
-        self.last_username = None
-        self._clear_session_file()
-    
-    def check_alive(self):
-        """Kiểm tra connection còn sống không"""
-        if not _clib or self.socket_fd <= 0:
-            return False
-        try:
-            result = _clib.check_connection(self.socket_fd)
-            return result == 1
-        except:
-            return False
-    
-    def send_message(self, action, data):
-        """Send JSON message via C library"""
-        message = {
-            "action": action,
-            "data": data
-        }
-        
-        try:
-            json_str = json.dumps(message)
-            msg_bytes = json_str.encode('utf-8')
-            
-            with self.lock:
-                if not self.connected or self.socket_fd <= 0:
-                    print("[Network] Not connected, attempting to reconnect...")
-                    if not self.reconnect():
-                        return False
-                
-                result = _clib.send_message(self.socket_fd, msg_bytes)
-                if result == 0:
-                    print(f"[Network] Sent: {json_str}")
-                    return True
-                else:
-                    print("[Network] Send failed")
-                    self.connected = False
-                    return False
-                
-        except Exception as e:
-            print(f"[Network] Send error: {e}")
-            self.connected = False
-            return False
-    
-    def receive_message(self, timeout=10.0):
-        """Receive JSON message via C library"""
-        # Note: timeout logic is handled in C library socket options
-        
-        try:
-            with self.lock:
-                if not self.connected or self.socket_fd <= 0:
-                    return None
-                
-                # Create buffer
-                buffer = ctypes.create_string_buffer(4096)
-                
-                # Call C receive (blocking with timeout set in connect)
-                bytes_read = _clib.receive_message(self.socket_fd, buffer, 4096)
-                
-                if bytes_read > 0:
-                    json_str = buffer.value.decode('utf-8').strip()
-                    if json_str:
-                        try:
-                            message = json.loads(json_str)
-                            print(f"[Network] Received: {json_str}")
-                            return message
-                        except json.JSONDecodeError:
-                            print(f"[Network] JSON parse error: {json_str}")
-                            return None
-                    return None
-                elif bytes_read == -1:
-                    return None
-                else:
-                    return None
-                
-        except Exception as e:
-            print(f"[Network] Receive error: {e}")
-            # Only mark disconnected on actual exceptions, not timeouts
-            self.connected = False
-            return None
-    
-    def is_connected(self):
-        """Check if connected to server"""
-        return self.connected
-    
-    def __del__(self):
-        """Cleanup on deletion"""
-        self.disconnect()
+import json
+import threading
+import time
+import os
+from collections import deque
+from config import SERVER_HOST, SERVER_PORT, NETWORK_BACKEND
+from transport import create_transport
+from logger import get_logger
+
+log = get_logger("network")
+
+# Session file path
+SESSION_FILE = os.path.expanduser("~/.chess_session.json")
+
+
+class NetworkClient:
+    """Client for communicating with C Server
+    
+    Bytes go through a transport chosen by NETWORK_BACKEND in config.py
+    (the C shared library or asyncio streams, see transport.py).
+    
+    Full duplex: the poll thread may block in receive while the UI thread
+    sends. Lock order is conn_lock -> recv_lock -> send_lock.
+    """
+    
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT):
+        self.host = host
+        self.port = port
+        self.transport = None
+        self.connected = False
+        self.send_lock = threading.Lock()  # One writer at a time
+        self.recv_lock = threading.Lock()  # One reader at a time (guards pending_messages)
+        self.conn_lock = threading.RLock()  # Serializes connect/disconnect/reconnect
+        self.generation = 0  # Bumped on every new connection
+        self.reconnect_attempts = 0
+        self.max_reconnect_attempts = 5
+        
+        # Frames received in a batch but not yet handed out by receive_message
+        self.pending_messages = deque()
+        
+        # Session tracking for reconnect
+        self.last_session_id = None
+        self.last_username = None
+        
+        # Load persisted session from file
+        self._load_session_from_file()
+    
+    def _load_session_from_file(self):
+        """Load saved session from file for reconnect after restart"""
+        try:
+            if os.path.exists(SESSION_FILE):
+                with open(SESSION_FILE, 'r') as f:
+                    data = json.load(f)
+                    self.last_session_id = data.get('session_id')
+                    self.last_username = data.get('username')
+                    log.info("Loaded saved session: %s", self.last_username)
+        except Exception as e:
+            log.warning("Could not load session: %s", e)
+    
+    def _save_session_to_file(self):
+        """Save session to file for reconnect after restart"""
+        try:
+            with open(SESSION_FILE, 'w') as f:
+                json.dump({
+                    'session_id': self.last_session_id,
+                    'username': self.last_username
+                }, f)
+            log.debug("Session saved to file")
+        except Exception as e:
+            log.warning("Could not save session: %s", e)
+    
+    def _clear_session_file(self):
+        """Clear session file on logout"""
+        try:
+            if os.path.exists(SESSION_FILE):
+                os.remove(SESSION_FILE)
+                log.debug("Session file cleared")
+        except:
+            pass
+    
+    def has_saved_session(self):
+        """Check if there's a saved session to try reconnecting"""
+        return self.last_session_id is not None and self.last_username is not None
+        
+    def connect(self):
+        """Establish connection to the server"""
+        with self.conn_lock:
+            try:
+                transport = create_transport(NETWORK_BACKEND)
+                
+                if transport.open(self.host, self.port):
+                    with self.recv_lock:
+                        self.pending_messages.clear()
+                    self.transport = transport
+                    self.generation += 1
+                    self.connected = True
+                    self.reconnect_attempts = 0
+                    log.info("Connected to server at %s:%s (%s)", self.host, self.port, transport)
+                    return True
+                else:
+                    self.connected = False
+                    return False
+                    
+            except Exception as e:
+                log.warning("Connection exception: %s", e)
+                self.connected = False
+                return False
+    
+    def _close_socket(self):
+        """Close the current connection without racing a blocked reader or writer
+        
+        Caller must hold conn_lock. The shutdown wakes a receive that is
+        waiting on the socket so recv_lock can be taken promptly.
+        """
+        transport = self.transport
+        self.connected = False
+        if transport is None:
+            return
+        try:
+            transport.shutdown()
+        except Exception:
+            pass
+        with self.recv_lock, self.send_lock:
+            try:
+                transport.close()
+            except Exception as e:
+                log.warning("Error during disconnect: %s", e)
+            self.transport = None
+            self.pending_messages.clear()
+    
+    def _mark_disconnected(self, generation):
+        """Flag a failed connection unless it has already been replaced"""
+        if generation == self.generation:
+            self.connected = False
+    
+    def disconnect(self):
+        """Close connection via C library"""
+        with self.conn_lock:
+            self._close_socket()
+            self.reconnect_attempts = 0
+            log.info("Disconnected from server")
+    
+    def reconnect(self, generation=None):
+        """Attempt to reconnect to the server
+        
+        generation is the connection the caller saw fail. If another thread
+        has already replaced it, the new connection is reused.
+        """
+        with self.conn_lock:
+            if generation is not None and generation != self.generation and self.connected:
+                return True
+            
+            if self.reconnect_attempts >= self.max_reconnect_attempts:
+                log.error("Max reconnection attempts reached")
+                return False
+            
+            log.info("Reconnecting... (attempt %d)", self.reconnect_attempts + 1)
+            
+            # Ensure old socket is fully closed
+            self._close_socket()
+            
+            time.sleep(1)  # Wait before reconnecting
+            self.reconnect_attempts += 1
+            return self.connect()
+    
+    def reconnect_with_session(self):
+        """Reconnect và restore session bằng sessionId đã lưu"""
+        if not self.last_session_id or not self.last_username:
+            log.info("No saved session to restore")
+            return False
+        
+        if not self.reconnect():
+            return False
+        
+        # Gửi RECONNECT request thay vì LOGIN
+        log.info("Attempting to restore session for %s", self.last_username)
+        return self.send_message("RECONNECT", {
+            "sessionId": self.last_session_id,
+            "username": self.last_username
+        })
+    
+    def save_session(self, session_id, username):
+        """Lưu session để có thể reconnect sau này"""
+        self.last_session_id = session_id
+        self.last_username = username
+        self._save_session_to_file()  # Persist to file
+        log.info("Session saved: %s (%.8s...)", username, session_id)
+    
+    def clear_session(self):
+        """Clear session on logout"""
+        self.last_session_id = None
+        self.last_username = None
+        self._clear_session_file()
+    
+    def check_alive(self):
+        """Kiểm tra connection còn sống không"""
+        transport = self.transport
+        if not self.connected or transport is None:
+            return False
+        try:
+            return transport.is_alive()
+        except:
+            return False
+    
+    def send_message(self, action, data, request_id=None):
+        """Send JSON message via C library (request_id is echoed in the replies)"""
+        message = {
+            "action": action,
+            "data": data
+        }
+        if request_id is not None:
+            message["requestId"] = request_id
+        
+        try:
+            json_str = json.dumps(message)
+            msg_bytes = json_str.encode('utf-8')
+            
+            if not self.connected or self.transport is None:
+                log.warning("Not connected, attempting to reconnect...")
+                if not self.reconnect(self.generation):
+                    return False
+            
+            with self.send_lock:
+                generation = self.generation
+                transport = self.transport
+                sent = transport is not None and transport.send(msg_bytes)
+            
+            if sent:
+                log.debug("Sent: %s", json_str)
+                return True
+            else:
+                log.warning("Send failed")
+                self._mark_disconnected(generation)
+                return False
+                
+        except Exception as e:
+            log.warning("Send error: %s", e)
+            self.connected = False
+            return False
+    
+    def receive_message(self, timeout=10.0):
+        """Receive one JSON message (buffered frames are returned first)"""
+        with self.recv_lock:
+            if not self.pending_messages:
+                self.pending_messages.extend(self._receive_batch(timeout))
+            if self.pending_messages:
+                return self.pending_messages.popleft()
+        return None
+    
+    def receive_messages(self, timeout=10.0):
+        """Receive every complete JSON message available, in one C call"""
+        with self.recv_lock:
+            if self.pending_messages:
+                messages = list(self.pending_messages)
+                self.pending_messages.clear()
+                return messages
+            return self._receive_batch(timeout)
+    
+    def _receive_batch(self, timeout):
+        """Read and decode one batch of frames (caller holds recv_lock)"""
+        generation = self.generation
+        try:
+            transport = self.transport
+            if not self.connected or transport is None:
+                return []
+            
+            # Waits up to timeout for the first frame
+            frames = transport.receive(timeout)
+            if frames is None:
+                # Peer closed the connection or the socket was shut down
+                self._mark_disconnected(generation)
+                return []
+            
+            messages = []
+            for frame in frames:
+                json_str = frame.decode('utf-8', errors='replace').strip()
+                if not json_str:
+                    continue
+                try:
+                    messages.append(json.loads(json_str))
+                    log.debug("Received: %s", json_str)
+                except json.JSONDecodeError:
+                    log.warning("JSON parse error: %s", json_str)
+            return messages
+                
+        except Exception as e:
+            log.warning("Receive error: %s", e)
+            # Only mark disconnected on actual exceptions, not timeouts
+            self._mark_disconnected(generation)
+            return []
+    
+    def is_connected(self):
+        """Check if connected to server"""
+        return self.connected
+    
+    def __del__(self):
+        """Cleanup on deletion"""
+        self.disconnect()
@@ -0,0 +1,213 @@
+"""
+Perft
+Move generation correctness and speed check on standard test positions
+
+    python perft.py                          # every position at its default depth
+    python perft.py -p kiwipete -d 4         # one position, deeper
+    python perft.py -p startpos --divide     # node count per first move
+    python perft.py --fen "<FEN>" -d 3 --divide --compare stockfish.txt
+    python perft.py --server ../../TCP/perft # also run the server's rules (make perft)
+    python perft.py --record                 # append the results to PERFT_RESULTS_FILE
+
+Exits with status 1 when a count differs from the known value.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from position import Position
+from movegen import legal_moves
+
+# name -> (FEN, default depth, known node counts for depth 1, 2, ...)
+POSITIONS = {
+    "startpos": ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 4,
+                 (20, 400, 8902, 197281, 4865609)),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 3,
+                 (48, 2039, 97862, 4085603)),
+    # En passant pins and discovered checks along the rank
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4,
+                  (14, 191, 2812, 43238, 674624)),
+    # Promotions with capture, castling with the rook attacked
+    "position4": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3,
+                  (6, 264, 9467, 422333)),
+    "position5": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3,
+                  (44, 1486, 62379, 2103487)),
+    "position6": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", 3,
+                  (46, 2079, 89890, 3894594)),
+    "ep-illegal-pin": ("3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", 4,
+                       (18, 92, 1670, 10138, 185429, 1134888)),
+    "ep-illegal-check": ("8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1", 4,
+                         (13, 102, 1266, 10276, 135655, 1015133)),
+    "ep-gives-check": ("8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", 4,
+                       (15, 126, 1928, 13931, 206379, 1440467)),
+    "promote-out-of-check": ("2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", 4,
+                             (11, 133, 1442, 19174, 266199, 3821001)),
+    "promote-gives-check": ("4k3/1P6/8/8/8/8/K7/8 w - - 0 1", 5,
+                            (9, 40, 472, 2661, 38983, 217342)),
+    "underpromote-check": ("8/P1k5/K7/8/8/8/8/8 w - - 0 1", 5,
+                           (6, 27, 273, 1329, 18135, 92683)),
+    "promote-stalemate": ("8/k1P5/8/1K6/8/8/8/8 w - - 0 1", 5,
+                          (10, 25, 268, 926, 10857, 43261, 567584)),
+}
+
+# Tracked benchmark history, one JSON object per run
+PERFT_RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "perft.jsonl")
+
+_DIVIDE_LINE = re.compile(r"^\s*([a-h][1-8][a-h][1-8][qrbn]?)\s*:\s*(\d+)\s*$")
+_SERVER_NODES = re.compile(r"^Nodes:\s*(\d+)", re.M)
+_SERVER_TIME = re.compile(r"^Time:\s*([\d.]+)s", re.M)
+
+
+def perft(position, depth):
+    """Number of leaf nodes depth plies below position"""
+    moves = legal_moves(position)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in moves:
+        undo = position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move(move, undo)
+    return nodes
+
+
+def divide(position, depth):
+    """Leaf nodes below each first move: {"e2e4": nodes}"""
+    counts = {}
+    for move in legal_moves(position):
+        undo = position.make_move(move)
+        counts[move.uci()] = perft(position, depth - 1)
+        position.unmake_move(move, undo)
+    return counts
+
+
+def parse_divide(text):
+    """Read "e2e4: 20" lines (Stockfish "go perft", the server's perft tool) into a dict"""
+    counts = {}
+    for line in text.splitlines():
+        match = _DIVIDE_LINE.match(line)
+        if match:
+            counts[match.group(1)] = int(match.group(2))
+    return counts
+
+
+def diff_divide(ours, reference):
+    """(move, our count, reference count) for every move where they disagree"""
+    return [(move, ours.get(move), reference.get(move))
+            for move in sorted(set(ours) | set(reference))
+            if ours.get(move) != reference.get(move)]
+
+
+def run_server_perft(binary, fen, depth):
+    """Run the server's perft tool; returns (nodes, seconds)"""
+    output = subprocess.run([binary, str(depth), fen], capture_output=True, text=True,
+                            check=True).stdout
+    return int(_SERVER_NODES.search(output).group(1)), float(_SERVER_TIME.search(output).group(1))
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Perft node counts for movegen.py")
+    parser.add_argument("-p", "--position", action="append", choices=sorted(POSITIONS),
+                        help="Test position (repeatable, default: all)")
+    parser.add_argument("-d", "--depth", type=int, help="Depth instead of each position's default")
+    parser.add_argument("--fen", help="Custom position (no known count to check against)")
+    parser.add_argument("--divide", action="store_true", help="Print node counts per first move")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="Divide output to diff against (\"-\" for stdin); implies --divide")
+    parser.add_argument("--server", metavar="BINARY",
+                        help="Server perft tool (TCP: make perft) to run on the same positions")
+    parser.add_argument("--record", action="store_true",
+                        help=f"Append results to {os.path.relpath(PERFT_RESULTS_FILE)}")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.fen:
+        cases = [("custom", args.fen, args.depth or 3, ())]
+    else:
+        cases = [(name,) + POSITIONS[name] for name in (args.position or POSITIONS)]
+
+    reference = None
+    if args.compare:
+        with (sys.stdin if args.compare == "-" else open(args.compare)) as f:
+            reference = parse_divide(f.read())
+
+    failed = False
+    results = []
+    print(f"{'position':<22}{'depth':>6}{'nodes':>12}{'seconds':>10}{'nodes/sec':>12}  result")
+    for name, fen, default_depth, known in cases:
+        depth = args.depth or default_depth
+        position = Position.from_fen(fen)
+
+        start = time.perf_counter()
+        if args.divide or reference is not None:
+            counts = divide(position, depth)
+            nodes = sum(counts.values())
+        else:
+            nodes = perft(position, depth)
+        seconds = time.perf_counter() - start
+        nps = nodes / seconds if seconds > 0 else 0.0
+
+        expected = known[depth - 1] if 0 < depth <= len(known) else None
+        status = "?" if expected is None else "ok" if nodes == expected else f"FAIL (expected {expected})"
+        failed |= expected is not None and nodes != expected
+        print(f"{name:<22}{depth:>6}{nodes:>12}{seconds:>10.3f}{nps:>12.0f}  {status}")
+        result = {"position": name, "depth": depth, "nodes": nodes,
+                  "seconds": round(seconds, 4), "nps": round(nps)}
+
+        if args.server:
+            server_nodes, server_seconds = run_server_perft(args.server, fen, depth)
+            match = "ok" if server_nodes == nodes else f"FAIL (client {nodes})"
+            failed |= server_nodes != nodes
+            server_nps = server_nodes / server_seconds if server_seconds > 0 else 0.0
+            print(f"{'  server':<22}{depth:>6}{server_nodes:>12}{server_seconds:>10.3f}"
+                  f"{server_nps:>12.0f}  {match}")
+            result.update(server_nodes=server_nodes, server_seconds=server_seconds,
+                          server_nps=round(server_nps))
+
+        if args.divide or reference is not None:
+            for move in sorted(counts):
+                print(f"  {move}: {counts[move]}")
+        if reference is not None:
+            differences = diff_divide(counts, reference)
+            failed |= bool(differences)
+            for move, ours, theirs in differences:
+                print(f"  DIFF {move}: ours {ours}, reference {theirs}")
+            if not differences:
+                print(f"  divide matches reference ({len(reference)} moves)")
+        results.append(result)
+
+    total_nodes = sum(r["nodes"] for r in results)
+    total_seconds = sum(r["seconds"] for r in results)
+    if total_seconds > 0:
+        print(f"{'total':<22}{'':>6}{total_nodes:>12}{total_seconds:>10.3f}{total_nodes / total_seconds:>12.0f}")
+
+    if args.record:
+        os.makedirs(os.path.dirname(PERFT_RESULTS_FILE), exist_ok=True)
+        record = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": _git_revision(),
+                  "python": platform.python_version(), "machine": platform.machine(),
+                  "passed": not failed, "results": results}
+        with open(PERFT_RESULTS_FILE, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Recorded to {PERFT_RESULTS_FILE}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
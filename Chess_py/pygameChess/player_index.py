@@ -0,0 +1,98 @@
+"""
+Player Index
+Prefix search and sort orders over the online player list
+"""
+
+from bisect import bisect_left
+
+# Sort column -> key; ties are broken by name
+SORT_KEYS = {
+    "name": lambda player: player["username"].lower(),
+    "status": lambda player: (player["status"] != "available", player["username"].lower()),
+    "wins": lambda player: (-player["wins"], player["username"].lower()),
+    "elo": lambda player: (-player["elo"], player["username"].lower()),
+}
+
+# Above every character a username can hold: prefix + _MAX_CHAR ends the prefix's range
+_MAX_CHAR = "\U0010ffff"
+
+
+class PlayerIndex:
+    """Player list sorted by name for prefix lookups, plus one order per sort column
+
+    query(prefix, sort) returns the indices (into players) of the players
+    whose name starts with prefix, in the column's order. The names matching
+    a prefix are one range of the name order, found with two bisects; a
+    player is in it when its rank in the name order falls inside the range.
+    Column orders are built on first use. Typing one more letter filters
+    the previous result instead of the whole column order, and a query
+    that matches few players sorts just those.
+    """
+
+    def __init__(self, players):
+        self.players = players
+        names = [player["username"].lower() for player in players]
+        self._by_name = sorted(range(len(players)), key=names.__getitem__)
+        self._names = [names[i] for i in self._by_name]
+        self._name_rank = [0] * len(players)
+        for rank, i in enumerate(self._by_name):
+            self._name_rank[i] = rank
+        self._orders = {"name": self._by_name}
+        self._ranks = {"name": self._name_rank}
+        self._last = (None, None, None)  # (prefix, sort, result)
+
+    def __len__(self):
+        return len(self.players)
+
+    def order(self, sort):
+        """Indices of all players in the order of a SORT_KEYS column"""
+        order = self._orders.get(sort)
+        if order is None:
+            key = SORT_KEYS[sort]
+            order = self._orders[sort] = sorted(range(len(self.players)),
+                                                key=lambda i: key(self.players[i]))
+        return order
+
+    def prefix_range(self, prefix):
+        """(lo, hi) range of the name order whose names start with prefix (lowercase)"""
+        return (bisect_left(self._names, prefix),
+                bisect_left(self._names, prefix + _MAX_CHAR))
+
+    def query(self, prefix="", sort="name"):
+        """Indices of the players whose name starts with prefix (lowercase), in sort order
+
+        The returned list is shared with the index: do not modify it.
+        """
+        last_prefix, last_sort, last = self._last
+        if prefix == last_prefix and sort == last_sort:
+            return last
+
+        if not prefix:
+            result = self.order(sort)
+        else:
+            lo, hi = self.prefix_range(prefix)
+            if sort == "name":
+                result = self._by_name[lo:hi]
+            else:
+                # Narrowing the last search only needs to look at its result
+                if last_sort == sort and last_prefix and prefix.startswith(last_prefix):
+                    candidates = last
+                else:
+                    candidates = self.order(sort)
+                if (hi - lo) * 8 < len(candidates):
+                    rank = self._rank(sort)
+                    result = sorted(self._by_name[lo:hi], key=rank.__getitem__)
+                else:
+                    name_rank = self._name_rank
+                    result = [i for i in candidates if lo <= name_rank[i] < hi]
+        self._last = (prefix, sort, result)
+        return result
+
+    def _rank(self, sort):
+        """Position of each player in a column's order"""
+        rank = self._ranks.get(sort)
+        if rank is None:
+            rank = self._ranks[sort] = [0] * len(self.players)
+            for position, i in enumerate(self.order(sort)):
+                rank[i] = position
+        return rank
@@ -0,0 +1,305 @@
+"""
+Chess Position
+Board state shared by move generation, rendering and replay
+"""
+
+PIECE_LETTERS = "pnbrqkPNBRQK"
+
+# Sides
+WHITE = 0
+BLACK = 1
+
+EMPTY = '.'
+
+# Castling rights bits
+CASTLE_WK = 1  # White king side (e1 -> g1)
+CASTLE_WQ = 2  # White queen side (e1 -> c1)
+CASTLE_BK = 4
+CASTLE_BQ = 8
+CASTLE_ALL = CASTLE_WK | CASTLE_WQ | CASTLE_BK | CASTLE_BQ
+
+# Same layout as the server's board string: square = row * 8 + col,
+# row 0 is rank 8, lowercase pieces are white and uppercase are black
+START_BOARD = ("RNBQKBNR" "PPPPPPPP" + EMPTY * 32 + "pppppppp" "rnbqkbnr")
+
+PIECE_NAMES = {
+    'p': 'pawn', 'n': 'knight', 'b': 'bishop',
+    'r': 'rook', 'q': 'queen', 'k': 'king',
+}
+
+# Rights lost when a piece leaves or lands on these squares
+_CASTLE_SQUARES = {
+    60: CASTLE_WK | CASTLE_WQ,  # e1
+    63: CASTLE_WK,              # h1
+    56: CASTLE_WQ,              # a1
+    4: CASTLE_BK | CASTLE_BQ,   # e8
+    7: CASTLE_BK,               # h8
+    0: CASTLE_BQ,               # a8
+}
+
+
+def square(x, y):
+    """Square index of board coordinates (x = column, y = row)"""
+    return y * 8 + x
+
+
+def coords(sq):
+    """Board coordinates (x, y) of a square index"""
+    return sq % 8, sq // 8
+
+
+def color_of(piece):
+    """WHITE for lowercase pieces, BLACK for uppercase"""
+    return WHITE if piece.islower() else BLACK
+
+
+def iter_squares(bitboard):
+    """Square indices of the set bits, lowest first"""
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+class Move:
+    """One move: from/to squares and the promotion piece letter, if any"""
+
+    __slots__ = ("src", "dst", "promotion")
+
+    def __init__(self, src, dst, promotion=None):
+        self.src = src
+        self.dst = dst
+        self.promotion = promotion  # 'q', 'r', 'b' or 'n'
+
+    def __eq__(self, other):
+        return (isinstance(other, Move) and self.src == other.src and
+                self.dst == other.dst and self.promotion == other.promotion)
+
+    def __hash__(self):
+        return hash((self.src, self.dst, self.promotion))
+
+    def __repr__(self):
+        return f"Move({self.uci()})"
+
+    def uci(self):
+        """Long algebraic notation, e.g. "e2e4" or "e7e8q" """
+        return square_to_notation(self.src) + square_to_notation(self.dst) + (self.promotion or "")
+
+
+def square_to_notation(sq):
+    """Square index -> "e4" """
+    x, y = coords(sq)
+    return chr(ord('a') + x) + str(8 - y)
+
+
+def notation_to_square(notation):
+    """ "e4" -> square index (case-insensitive)"""
+    x = ord(notation[0].lower()) - ord('a')
+    y = 8 - int(notation[1])
+    return square(x, y)
+
+
+def _castling_rights(castling):
+    """CASTLE_* bits of a "KQkq"-style string"""
+    return ((CASTLE_WK if 'K' in castling else 0) | (CASTLE_WQ if 'Q' in castling else 0) |
+            (CASTLE_BK if 'k' in castling else 0) | (CASTLE_BQ if 'q' in castling else 0))
+
+
+class Position:
+    """Bitboards and mailbox board plus side to move, castling rights and en passant square
+
+    bitboards[piece] has bit sq set when that piece stands on sq and
+    occupancy[color] is the union for one side. board is the 64-entry
+    mailbox for direct square lookup; both views are kept in step by
+    make_move / unmake_move.
+    """
+
+    def __init__(self, board=START_BOARD, side=WHITE, castling=CASTLE_ALL, ep_square=-1):
+        self.board = list(board)
+        self.side = side
+        self.castling = castling
+        self.ep_square = ep_square  # Square a pawn can capture onto en passant, -1 if none
+
+        self.bitboards = dict.fromkeys(PIECE_LETTERS, 0)
+        self.occupancy = [0, 0]
+        for sq, piece in enumerate(self.board):
+            if piece != EMPTY:
+                self.bitboards[piece] |= 1 << sq
+                self.occupancy[color_of(piece)] |= 1 << sq
+
+    @classmethod
+    def from_board_string(cls, board, side=WHITE, castling=None, ep_col=-1):
+        """Build a position from the server's 64-char board string
+
+        castling is a "KQkq"-style string; when it is unknown the rights are
+        inferred from kings and rooks still on their home squares.
+        ep_col is the file of a pawn that just moved two squares.
+        """
+        if len(board) != 64:
+            raise ValueError(f"Board string must have 64 squares, got {len(board)}")
+
+        if castling is None:
+            rights = 0
+            if board[60] == 'k':
+                rights |= (CASTLE_WK if board[63] == 'r' else 0) | (CASTLE_WQ if board[56] == 'r' else 0)
+            if board[4] == 'K':
+                rights |= (CASTLE_BK if board[7] == 'R' else 0) | (CASTLE_BQ if board[0] == 'R' else 0)
+        else:
+            rights = _castling_rights(castling)
+
+        ep_square = -1
+        if ep_col is not None and 0 <= ep_col < 8:
+            # The pawn that moved belongs to the side that is not to move
+            ep_square = square(ep_col, 2 if side == WHITE else 5)
+
+        return cls(board, side, rights, ep_square)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Build a position from standard FEN (uppercase = white there, so cases are swapped)"""
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"FEN needs at least 4 fields: {fen!r}")
+        placement, side, castling, ep = fields[:4]
+
+        board = []
+        for char in placement:
+            if char.isdigit():
+                board.extend(EMPTY * int(char))
+            elif char != '/':
+                board.append(char.swapcase())
+        if len(board) != 64:
+            raise ValueError(f"FEN board must have 64 squares: {fen!r}")
+
+        ep_square = notation_to_square(ep) if ep != '-' else -1
+        return cls(board, WHITE if side == 'w' else BLACK, _castling_rights(castling), ep_square)
+
+    def to_board_string(self):
+        """64-char board string in the server's layout"""
+        return "".join(self.board)
+
+    def copy(self):
+        """Independent copy of this position"""
+        position = Position.__new__(Position)
+        position.board = self.board[:]
+        position.side = self.side
+        position.castling = self.castling
+        position.ep_square = self.ep_square
+        position.bitboards = self.bitboards.copy()
+        position.occupancy = self.occupancy[:]
+        return position
+
+    def __eq__(self, other):
+        return (isinstance(other, Position) and self.board == other.board and
+                self.side == other.side and self.castling == other.castling and
+                self.ep_square == other.ep_square)
+
+    def piece_at(self, x, y):
+        """Piece letter on (x, y), EMPTY if none"""
+        return self.board[y * 8 + x]
+
+    def color_at(self, x, y):
+        """WHITE or BLACK for the piece on (x, y), None if the square is empty"""
+        bit = 1 << (y * 8 + x)
+        if self.occupancy[WHITE] & bit:
+            return WHITE
+        if self.occupancy[BLACK] & bit:
+            return BLACK
+        return None
+
+    def pieces(self, color):
+        """(square, piece letter) for every piece of color"""
+        board = self.board
+        return [(sq, board[sq]) for sq in iter_squares(self.occupancy[color])]
+
+    def king_square(self, color):
+        """Square of color's king, -1 if it is missing"""
+        return self.bitboards['k' if color == WHITE else 'K'].bit_length() - 1
+
+    def move_between(self, src, dst, promotion=None):
+        """Move from src to dst; promotion only counts for a pawn reaching the last rank (queen by default)"""
+        if self.board[src] not in 'pP' or dst // 8 not in (0, 7):
+            return Move(src, dst)
+        promotion = (promotion or 'q').lower()
+        if promotion not in 'qrbn':
+            promotion = 'q'
+        return Move(src, dst, promotion)
+
+    def parse_move(self, text):
+        """Move for "e2e4" / "e7e8q" (case-insensitive), None if there is no piece on the from square"""
+        if len(text) < 4:
+            return None
+        src, dst = notation_to_square(text[:2]), notation_to_square(text[2:4])
+        if self.board[src] == EMPTY:
+            return None
+        return self.move_between(src, dst, text[4:5] or None)
+
+    def _put(self, sq, piece):
+        self.board[sq] = piece
+        bit = 1 << sq
+        self.bitboards[piece] |= bit
+        self.occupancy[color_of(piece)] |= bit
+
+    def _remove(self, sq):
+        piece = self.board[sq]
+        self.board[sq] = EMPTY
+        bit = 1 << sq
+        self.bitboards[piece] ^= bit
+        self.occupancy[color_of(piece)] ^= bit
+        return piece
+
+    def make_move(self, move):
+        """Play move (assumed legal) and return the state needed to undo it"""
+        board = self.board
+        piece = board[move.src]
+        captured = board[move.dst]
+        undo = (captured, self.castling, self.ep_square, EMPTY)
+        kind = piece.lower()
+
+        if captured != EMPTY:
+            self._remove(move.dst)
+        self._remove(move.src)
+        self._put(move.dst, piece)
+
+        if kind == 'p':
+            if move.dst == self.ep_square:
+                # En passant: the captured pawn is beside the moving one
+                victim = move.dst + (8 if piece == 'p' else -8)
+                undo = (captured, self.castling, self.ep_square, self._remove(victim))
+            if move.promotion:
+                self._remove(move.dst)
+                self._put(move.dst, move.promotion if piece == 'p' else move.promotion.upper())
+        elif kind == 'k' and abs(move.dst - move.src) == 2:
+            # Castling: move the rook next to the king
+            if move.dst > move.src:
+                self._put(move.src + 1, self._remove(move.src + 3))
+            else:
+                self._put(move.src - 1, self._remove(move.src - 4))
+
+        self.ep_square = -1
+        if kind == 'p' and abs(move.dst - move.src) == 16:
+            self.ep_square = (move.src + move.dst) // 2
+
+        self.castling &= ~(_CASTLE_SQUARES.get(move.src, 0) | _CASTLE_SQUARES.get(move.dst, 0))
+        self.side ^= 1
+        return undo
+
+    def unmake_move(self, move, undo):
+        """Take back move using the state returned by make_move"""
+        captured, self.castling, self.ep_square, ep_victim = undo
+        self.side ^= 1
+
+        piece = self._remove(move.dst)
+        if move.promotion:
+            piece = 'p' if self.side == WHITE else 'P'
+        self._put(move.src, piece)
+        if captured != EMPTY:
+            self._put(move.dst, captured)
+
+        if ep_victim != EMPTY:
+            self._put(move.dst + (8 if piece == 'p' else -8), ep_victim)
+        elif piece.lower() == 'k' and abs(move.dst - move.src) == 2:
+            if move.dst > move.src:
+                self._put(move.src + 3, self._remove(move.src + 1))
+            else:
+                self._put(move.src - 4, self._remove(move.src - 1))
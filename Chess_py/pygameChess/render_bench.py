@@ -0,0 +1,240 @@
+"""
+Render Benchmark
+Frame rate and per-frame allocations of each screen, drawn headless with the SDL dummy driver
+
+    python render_bench.py                       # every scene
+    python render_bench.py -s players -n 500     # one scene, more frames
+    python render_bench.py --players 5000        # a bigger player list
+    python render_bench.py --record              # append the results to RENDER_RESULTS_FILE
+
+Every frame repaints the whole scene and flips the (dummy) display, as the
+client does on a scene change. The lists scroll a little each frame and the
+replay steps one ply, so what is measured is the steady-state cost of
+drawing, not of a still screen.
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Before pygame opens a window
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import pygame
+
+# Tracked benchmark history, one JSON object per run
+RENDER_RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "render.jsonl")
+
+FRAME_SECONDS = 1 / 60  # dt handed to view animations
+WARMUP_FRAMES = 10      # Fill the font, text and sprite caches first
+ALLOC_FRAMES = 50       # Frames traced for allocations (tracemalloc is slow)
+
+# Middle game with every piece type still on the board (perft's "kiwipete")
+MIDGAME_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+# Morphy's Opera Game in the server's move format
+REPLAY_MOVES = ["E2E4", "E7E5", "G1F3", "D7D6", "D2D4", "C8G4", "D4E5", "G4F3", "D1F3", "D6E5",
+                "F1C4", "G8F6", "F3B3", "D8E7", "B1C3", "C7C6", "C1G5", "B7B5", "C3B5", "C6B5",
+                "C4B5", "B8D7", "E1C1", "A8D8", "D1D7", "D8D7", "H1D1", "E7E6", "B5D7", "F6D7",
+                "B3B8", "D7B8", "D1D8"]
+
+
+def _players(count):
+    """Fake REQUEST_PLAYER_LIST entries, as the players view stores them"""
+    return [{"username": f"player{i:05d}", "status": "available" if i % 3 else "in_game",
+             "wins": i % 97, "losses": i % 89, "elo": 800 + i * 7 % 1400} for i in range(count)]
+
+
+def _matches(count, username):
+    """Fake MATCH_HISTORY entries"""
+    results = (username, "DRAW", "ABORT", "rival")
+    return [{"matchId": f"{i:08x}-match", "white": username if i % 2 else "rival",
+             "black": "rival" if i % 2 else username, "winner": results[i % 4],
+             "timestamp": 1700000000 + i * 3600, "moveCount": 20 + i % 60} for i in range(count)]
+
+
+def _scroll(view, frame):
+    """Walk a list view down to the bottom and start over"""
+    if view.max_scroll > 0:
+        view.scroll_offset = (frame * 37) % view.max_scroll
+
+
+def scene_auth(main, args):
+    view = main.auth_view
+    view.input_username.text = "player00042"
+
+    def frame(i):
+        view.update(FRAME_SECONDS)
+        view.draw()
+    return frame
+
+
+def scene_menu(main, args):
+    view = main.menu_view
+    view.set_session_data({"username": "player00042", "sessionId": "bench"})
+    return lambda i: view.draw()
+
+
+def scene_players(main, args):
+    view = main.players_view
+    view.set_session_data({"username": "player00042", "sessionId": "bench"})
+    view.online_players = _players(args.players)
+    view.message = f"Found {len(view.online_players)} players online"
+
+    def frame(i):
+        _scroll(view, i)
+        view.update(FRAME_SECONDS)
+        view.draw()
+    return frame
+
+
+def scene_history(main, args):
+    view = main.match_history_view
+    view.set_session_data({"username": "player00042", "sessionId": "bench"})
+    view.matches = _matches(args.matches, "player00042")
+
+    def frame(i):
+        _scroll(view, i)
+        view.update(FRAME_SECONDS)
+        view.draw()
+    return frame
+
+
+def scene_game(main, args):
+    main.reset_game_state()
+    main.online_game_active = True
+    main.online_my_role = "white"
+    main.online_opponent_name = "rival"
+    main.session_data = {"username": "player00042", "sessionId": "bench"}
+    main.game_position = main.Position.from_fen(MIDGAME_FEN)
+    main.captured_pieces_white = ["pawn", "pawn", "knight"]
+    main.captured_pieces_black = ["pawn", "bishop"]
+    # White queen on f3 selected, with its moves shown
+    main.selection = main.square(5, 5)
+    main.valid_moves = main.legal_destinations(main.game_position, 5, 5)
+
+    def frame(i):
+        main.draw_board()
+        main.draw_pieces()
+        main.draw_captured()
+        main.draw_timers()
+        main.draw_valid(main.valid_moves)
+    return frame
+
+
+def scene_replay(main, args):
+    main.reset_game_state()
+    main.online_game_active = False
+    main.load_replay_data(REPLAY_MOVES)
+
+    def frame(i):
+        main.seek_replay(i % (main.replay.ply_count + 1))
+        if not main.replay.is_decoded:
+            main.replay.decode()
+        main.game_position = main.replay.position_at(main.replay_index)
+        main.draw_board()
+        main.draw_pieces()
+        main.draw_captured()
+        main.draw_replay_controls()
+    return frame
+
+
+SCENES = {
+    "auth": scene_auth,
+    "menu": scene_menu,
+    "players": scene_players,
+    "history": scene_history,
+    "game": scene_game,
+    "replay": scene_replay,
+}
+
+
+def run_scene(frame, frames):
+    """Time frames calls of frame (+ display flip), then measure their allocations
+
+    Returns (seconds, allocated bytes per frame, bytes kept per frame). The
+    allocations come from a second pass under tracemalloc (which slows
+    drawing down, so it only covers ALLOC_FRAMES frames): the peak of traced
+    memory during a frame above what was traced when it started, and what
+    is still traced once it ended.
+    """
+    for i in range(WARMUP_FRAMES):
+        frame(i)
+        pygame.display.flip()
+
+    start = time.perf_counter()
+    for i in range(frames):
+        frame(i)
+        pygame.display.flip()
+    seconds = time.perf_counter() - start
+
+    allocated = kept = 0
+    traced = min(frames, ALLOC_FRAMES)
+    tracemalloc.start()
+    try:
+        for i in range(traced):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            frame(i)
+            pygame.display.flip()
+            current, peak = tracemalloc.get_traced_memory()
+            allocated += peak - before
+            kept += current - before
+    finally:
+        tracemalloc.stop()
+    return seconds, allocated / traced, kept / traced
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Headless frame rate of each client screen")
+    parser.add_argument("-s", "--scene", action="append", choices=list(SCENES),
+                        help="Scene to draw (repeatable, default: all)")
+    parser.add_argument("-n", "--frames", type=int, default=200, help="Frames per scene (default: 200)")
+    parser.add_argument("--players", type=int, default=1000, help="Players in the players list (default: 1000)")
+    parser.add_argument("--matches", type=int, default=5000, help="Matches in the history (default: 5000)")
+    parser.add_argument("--record", action="store_true",
+                        help=f"Append results to {os.path.relpath(RENDER_RESULTS_FILE)}")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    import main as client  # Opens the (dummy) window and builds the views
+
+    results = []
+    print(f"{'scene':<10}{'frames':>8}{'seconds':>10}{'fps':>10}{'ms/frame':>10}{'alloc KiB':>11}{'kept B':>9}")
+    for name in args.scene or SCENES:
+        frame = SCENES[name](client, args)
+        seconds, allocated, kept = run_scene(frame, args.frames)
+        fps = args.frames / seconds if seconds > 0 else 0.0
+        print(f"{name:<10}{args.frames:>8}{seconds:>10.3f}{fps:>10.1f}{seconds / args.frames * 1000:>10.2f}"
+              f"{allocated / 1024:>11.1f}{kept:>9.0f}")
+        results.append({"scene": name, "frames": args.frames, "seconds": round(seconds, 4),
+                        "fps": round(fps, 1), "alloc_bytes": round(allocated), "kept_bytes": round(kept)})
+
+    if args.record:
+        os.makedirs(os.path.dirname(RENDER_RESULTS_FILE), exist_ok=True)
+        record = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": _git_revision(),
+                  "python": platform.python_version(), "machine": platform.machine(),
+                  "players": args.players, "matches": args.matches, "results": results}
+        with open(RENDER_RESULTS_FILE, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Recorded to {RENDER_RESULTS_FILE}")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
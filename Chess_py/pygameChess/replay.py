@@ -0,0 +1,114 @@
+"""
+Replay Storage
+Keyframes plus per-move deltas for stepping and seeking through a finished game
+"""
+
+from config import REPLAY_KEYFRAME_INTERVAL, REPLAY_DECODE_PLIES_PER_FRAME
+from position import Position
+
+
+def _snapshot(position):
+    """Compact copy of a position: (board string, side, castling, en passant square)"""
+    return position.to_board_string(), position.side, position.castling, position.ep_square
+
+
+class Replay:
+    """Moves of a game with a keyframe every keyframe_interval plies
+
+    Only one Position is kept (the cursor). Seeking restores the nearest
+    keyframe at or before the target ply and plays at most
+    keyframe_interval - 1 moves, or steps from the cursor when that is
+    shorter (backwards through the undo info of the moves it played).
+    Memory is one Move per ply plus a 64-char board per keyframe.
+
+    Nothing is decoded up front: ply 0 is available at once, decode() is
+    called a few plies per frame to work ahead, and seeking past the
+    decoded part decodes up to the target on demand.
+    """
+
+    def __init__(self, move_strings, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.move_strings = list(move_strings)
+        self.moves = []  # Move per decoded ply; None when the server's move could not be applied
+        self.keyframes = [_snapshot(Position())]  # At plies 0, interval, 2 * interval, ...
+        self._decoder = Position()
+
+        self._cursor = Position()
+        self._ply = 0
+        self._undo = []  # Undo info for the moves played since the last keyframe restore
+        self._base = 0   # Ply the cursor was last restored to
+
+    @property
+    def ply_count(self):
+        """Number of plies; valid plies are 0 (start) .. ply_count"""
+        return len(self.move_strings)
+
+    @property
+    def decoded_plies(self):
+        """Plies decoded so far"""
+        return len(self.moves)
+
+    @property
+    def is_decoded(self):
+        """True once every move has been decoded"""
+        return len(self.moves) == len(self.move_strings)
+
+    def decode(self, max_plies=REPLAY_DECODE_PLIES_PER_FRAME):
+        """Decode up to max_plies more moves (None = all); returns is_decoded"""
+        end = len(self.move_strings)
+        if max_plies is not None:
+            end = min(end, len(self.moves) + max_plies)
+
+        position = self._decoder
+        while len(self.moves) < end:
+            move = position.parse_move(self.move_strings[len(self.moves)])
+            if move:
+                position.make_move(move)
+            self.moves.append(move)
+            if len(self.moves) % self.keyframe_interval == 0:
+                self.keyframes.append(_snapshot(position))
+        return self.is_decoded
+
+    @property
+    def ply(self):
+        """Ply the cursor is on"""
+        return self._ply
+
+    def position_at(self, ply):
+        """Position after ply moves (0 = start); the returned object is reused, do not modify it"""
+        ply = max(0, min(ply, self.ply_count))
+        if ply > len(self.moves):
+            self.decode(ply - len(self.moves))
+        if ply == self._ply:
+            return self._cursor
+
+        keyframe_ply = ply - ply % self.keyframe_interval
+        if ply > self._ply and self._ply >= keyframe_ply:
+            self._forward(ply)
+        elif self._base <= ply < self._ply and self._ply - ply < ply - keyframe_ply + 1:
+            self._backward(ply)
+        else:
+            self._restore(keyframe_ply)
+            self._forward(ply)
+        return self._cursor
+
+    def _restore(self, keyframe_ply):
+        board, side, castling, ep_square = self.keyframes[keyframe_ply // self.keyframe_interval]
+        self._cursor = Position(board, side, castling, ep_square)
+        self._ply = self._base = keyframe_ply
+        self._undo = []
+
+    def _forward(self, ply):
+        cursor = self._cursor
+        while self._ply < ply:
+            move = self.moves[self._ply]
+            self._undo.append(cursor.make_move(move) if move else None)
+            self._ply += 1
+
+    def _backward(self, ply):
+        cursor = self._cursor
+        while self._ply > ply:
+            self._ply -= 1
+            undo = self._undo.pop()
+            if undo is not None:
+                cursor.unmake_move(self.moves[self._ply], undo)
@@ -0,0 +1,60 @@
+"""
+Piece Sprites
+Piece images loaded once, converted to the display format and cached per size
+"""
+
+import os
+import pygame
+from position import PIECE_NAMES
+
+PIECE_IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'images')
+
+# Sizes used by the game screen (pixels)
+PIECE_SIZE = 80     # Pieces on a 100px square
+PAWN_SIZE = 65      # Pawns are drawn a bit smaller
+CAPTURED_SIZE = 45  # Captured pieces tray
+
+
+class SpriteAtlas:
+    """Piece images scaled to each requested size, converted with convert_alpha()
+
+    The source PNGs are large, so they are not kept: preload() decodes each
+    file once and builds every size asked for. A size that was not
+    preloaded is built on first use (loading that file again). Converting
+    needs a display mode; without one the images are kept as loaded.
+    """
+
+    def __init__(self, image_dir=PIECE_IMAGE_DIR):
+        self.image_dir = image_dir
+        self._images = {}  # (color, name, size) -> Surface
+
+    def preload(self, sizes=(PIECE_SIZE, PAWN_SIZE, CAPTURED_SIZE)):
+        """Build every piece at each of sizes, decoding each file once"""
+        for color in ('white', 'black'):
+            for name in PIECE_NAMES.values():
+                missing = [size for size in sizes if (color, name, size) not in self._images]
+                if missing:
+                    source = self._load(color, name)
+                    for size in missing:
+                        self._images[color, name, size] = self._scale(source, size)
+
+    def image(self, color, name, size):
+        """Piece image ('white' / 'black', 'queen', ...) scaled to size x size"""
+        key = (color, name, size)
+        surface = self._images.get(key)
+        if surface is None:
+            surface = self._images[key] = self._scale(self._load(color, name), size)
+        return surface
+
+    def piece(self, letter, size):
+        """Image for a board letter (lowercase = white)"""
+        return self.image('white' if letter.islower() else 'black', PIECE_NAMES[letter.lower()], size)
+
+    def _load(self, color, name):
+        return pygame.image.load(os.path.join(self.image_dir, f'{color} {name}.png'))
+
+    def _scale(self, source, size):
+        surface = pygame.transform.smoothscale(source, (size, size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
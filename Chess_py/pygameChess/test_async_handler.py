@@ -0,0 +1,126 @@
+"""
+Async Handler Tests
+Request / response matching and action routing, without a socket
+"""
+
+import pytest
+from async_handler import AsyncMessageHandler
+
+
+class FakeNetwork:
+    """Records what request() sends; send_ok=False makes sends fail"""
+
+    def __init__(self, send_ok=True):
+        self.send_ok = send_ok
+        self.sent = []
+
+    def send_message(self, action, data, request_id=None):
+        self.sent.append((action, data, request_id))
+        return self.send_ok
+
+
+@pytest.fixture
+def handler():
+    return AsyncMessageHandler(FakeNetwork())
+
+
+def reply(action, request_id=None, **data):
+    message = {"action": action, "data": data}
+    if request_id is not None:
+        message["requestId"] = request_id
+    return message
+
+
+def test_request_sends_a_fresh_request_id(handler):
+    handler.request("GET_PROFILE", {"username": "a"}, ("PROFILE",))
+    handler.request("GET_PROFILE", {"username": "b"}, ("PROFILE",))
+    ids = [request_id for _, _, request_id in handler.network.sent]
+    assert len(set(ids)) == 2 and all(ids)
+
+
+def test_reply_resolves_the_request_with_its_id(handler):
+    first = handler.request("GET_PROFILE", {}, ("PROFILE",))
+    second = handler.request("GET_PROFILE", {}, ("PROFILE",))
+    second_id = handler.network.sent[1][2]
+
+    handler._handle_async_message(reply("PROFILE", second_id, username="b"))
+
+    assert second.result(0)["data"] == {"username": "b"}
+    assert not first.done()
+
+
+def test_reply_without_id_resolves_the_oldest_matching_request(handler):
+    history = handler.request("GET_MATCH_HISTORY", {}, ("MATCH_HISTORY",))
+    first = handler.request("GET_PROFILE", {}, ("PROFILE",))
+    second = handler.request("GET_PROFILE", {}, ("PROFILE",))
+
+    handler._handle_async_message(reply("PROFILE"))
+
+    assert first.done() and not second.done() and not history.done()
+
+
+def test_stale_request_id_is_queued_instead_of_answering_another_request(handler):
+    pending = handler.request("REQUEST_PLAYER_LIST", {}, ("PLAYER_LIST",))
+
+    handler._handle_async_message(reply("PLAYER_LIST", "999", players=[]))
+
+    assert not pending.done()
+    assert handler.get("PLAYER_LIST") == {"players": []}
+
+
+def test_cancelled_request_swallows_its_reply(handler):
+    pending = handler.request("GET_PROFILE", {}, ("PROFILE",))
+    pending.cancel()
+
+    handler._handle_async_message(reply("PROFILE", handler.network.sent[0][2]))
+
+    assert not handler.pending_requests
+    assert not handler.has_pending_messages()
+
+
+def test_failed_send_fails_the_request():
+    handler = AsyncMessageHandler(FakeNetwork(send_ok=False))
+    pending = handler.request("GET_PROFILE", {}, ("PROFILE",))
+
+    with pytest.raises(ConnectionError):
+        pending.result(0)
+    assert not handler.pending_requests
+
+
+def test_expired_request_times_out_and_callback_gets_none(handler):
+    results = []
+    pending = handler.request("GET_PROFILE", {}, ("PROFILE",), callback=results.append, timeout=-1)
+
+    handler._expire_requests()
+
+    with pytest.raises(TimeoutError):
+        pending.result(0)
+    assert results == [None]
+
+
+def test_unrequested_messages_go_to_their_queue(handler):
+    handler._handle_async_message(reply("OPPONENT_MOVE", **{"from": "e7", "to": "e5"}))
+    handler._handle_async_message(reply("GAME_RESULT", winner="a"))  # Alias of GAME_OVER
+    handler._handle_async_message(reply("SOMETHING_NEW"))
+
+    assert handler.get("OPPONENT_MOVE") == {"from": "e7", "to": "e5"}
+    assert handler.get("GAME_OVER") == {"winner": "a"}
+    assert handler.other_messages[0]["action"] == "SOMETHING_NEW"
+    assert handler.get("OPPONENT_MOVE") is None
+
+
+def test_subscriber_sees_messages_and_can_consume_them(handler):
+    seen = []
+    handler.subscribe("GAME_OVER", lambda data: seen.append(data))
+    handler._handle_async_message(reply("GAME_RESULT", winner="a"))
+    assert seen == [{"winner": "a"}]
+    assert handler.get("GAME_OVER") == {"winner": "a"}
+
+    consume = lambda data: True
+    handler.subscribe("GAME_OVER", consume)
+    handler._handle_async_message(reply("GAME_OVER", winner="b"))
+    assert handler.get("GAME_OVER") is None
+
+    handler.unsubscribe("GAME_OVER", consume)
+    handler._handle_async_message(reply("GAME_OVER", winner="c"))
+    assert handler.get("GAME_OVER") == {"winner": "c"}
@@ -0,0 +1,78 @@
+"""
+Move Generation Tests
+Legal move counts on the perft positions plus the special moves the client must get right
+"""
+
+import pytest
+from position import Position, notation_to_square
+from movegen import legal_moves, legal_destinations, in_check, has_legal_moves
+from perft import POSITIONS, perft
+
+# Shallow enough for every test run; perft.py goes deeper
+TEST_DEPTH = 2
+
+
+def uci_moves(position):
+    return sorted(move.uci() for move in legal_moves(position))
+
+
+@pytest.mark.parametrize("name", sorted(POSITIONS))
+def test_perft_node_counts(name):
+    fen, _, counts = POSITIONS[name]
+    position = Position.from_fen(fen)
+    for depth in range(1, TEST_DEPTH + 1):
+        assert perft(position, depth) == counts[depth - 1], f"{name} depth {depth}"
+
+
+def test_perft_leaves_the_position_unchanged():
+    fen = POSITIONS["kiwipete"][0]
+    position = Position.from_fen(fen)
+    perft(position, 2)
+    assert position == Position.from_fen(fen)
+    assert position.bitboards == Position.from_fen(fen).bitboards
+
+
+def test_promotion_offers_all_four_pieces():
+    position = Position.from_fen("8/P7/8/8/8/8/8/k6K w - - 0 1")
+    promotions = [uci for uci in uci_moves(position) if uci.startswith("a7")]
+    assert promotions == ["a7a8b", "a7a8n", "a7a8q", "a7a8r"]
+    # The board highlights the square once
+    assert legal_destinations(position, 0, 1) == [(0, 0)]
+
+
+def test_castling_needs_empty_and_unattacked_squares():
+    position = Position.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    assert {"e1g1", "e1c1"} <= set(uci_moves(position))
+
+    # Black rook on f8 covers f1: no king side castling
+    position = Position.from_fen("r3kr2/8/8/8/8/8/8/R3K2R w KQq - 0 1")
+    moves = uci_moves(position)
+    assert "e1g1" not in moves and "e1c1" in moves
+
+
+def test_en_passant_capture():
+    position = Position.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    assert "e5d6" in uci_moves(position)
+    position = Position.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - - 0 1")
+    assert "e5d6" not in uci_moves(position)
+
+
+def test_pinned_piece_stays_on_the_pin_line():
+    # White bishop on e2 is pinned by the rook on e8
+    position = Position.from_fen("4r1k1/8/8/8/8/8/4B3/4K3 w - - 0 1")
+    assert legal_destinations(position, 4, 6) == []
+
+
+def test_checkmate_and_stalemate():
+    mate = Position.from_fen("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+    assert in_check(mate, mate.side) and not has_legal_moves(mate)
+
+    stalemate = Position.from_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+    assert not in_check(stalemate, stalemate.side) and not has_legal_moves(stalemate)
+
+
+def test_server_move_strings_parse_to_legal_moves():
+    position = Position()
+    move = position.parse_move("E2E4")
+    assert move in legal_moves(position)
+    assert move.src == notation_to_square("e2") and move.dst == notation_to_square("e4")
@@ -0,0 +1,82 @@
+"""
+Player Index Tests
+Prefix search and sort orders checked against a plain filter and sort
+"""
+
+import random
+import pytest
+from player_index import PlayerIndex, SORT_KEYS
+
+
+def make_players(count, seed=1):
+    rng = random.Random(seed)
+    players = []
+    for i in range(count):
+        name = "".join(rng.choice("abcAB_1") for _ in range(rng.randint(1, 6))) + str(i)
+        players.append({"username": name,
+                        "status": rng.choice(("available", "in_game")),
+                        "wins": rng.randint(0, 20),
+                        "elo": rng.randint(800, 2000)})
+    return players
+
+
+def brute_force(players, prefix, sort):
+    matches = [i for i, player in enumerate(players) if player["username"].lower().startswith(prefix)]
+    return sorted(matches, key=lambda i: SORT_KEYS[sort](players[i]))
+
+
+@pytest.fixture(scope="module")
+def players():
+    return make_players(500)
+
+
+@pytest.mark.parametrize("sort", sorted(SORT_KEYS))
+def test_every_prefix_matches_brute_force(players, sort):
+    index = PlayerIndex(players)
+    prefixes = {""} | {p["username"].lower()[:n] for p in players[:60] for n in range(1, 4)} | {"zz", "_"}
+    for prefix in sorted(prefixes):
+        assert index.query(prefix, sort) == brute_force(players, prefix, sort), prefix
+
+
+@pytest.mark.parametrize("sort", sorted(SORT_KEYS))
+def test_typing_and_deleting_letters(players, sort):
+    index = PlayerIndex(players)
+    word = players[7]["username"].lower()
+    # Narrowing reuses the last result; deleting starts from the full order again
+    for prefix in [word[:n] for n in range(len(word) + 1)] + [word[:n] for n in range(len(word), -1, -1)]:
+        assert index.query(prefix, sort) == brute_force(players, prefix, sort), prefix
+
+
+def test_switching_sort_keeps_the_prefix(players):
+    index = PlayerIndex(players)
+    for sort in ["elo", "name", "wins", "status", "elo"]:
+        assert index.query("a", sort) == brute_force(players, "a", sort)
+
+
+def test_sort_orders():
+    players = [
+        {"username": "Carol", "status": "in_game", "wins": 5, "elo": 1300},
+        {"username": "alice", "status": "available", "wins": 5, "elo": 1500},
+        {"username": "Bob", "status": "available", "wins": 9, "elo": 1300},
+    ]
+    index = PlayerIndex(players)
+    names = lambda sort: [players[i]["username"] for i in index.query("", sort)]
+    assert names("name") == ["alice", "Bob", "Carol"]
+    assert names("status") == ["alice", "Bob", "Carol"]
+    assert names("wins") == ["Bob", "alice", "Carol"]
+    assert names("elo") == ["alice", "Bob", "Carol"]
+
+
+def test_prefix_is_a_range_of_the_name_order():
+    players = [{"username": name, "status": "available", "wins": 0, "elo": 1200}
+               for name in ("ann", "Anna", "bob", "annette", "an")]
+    index = PlayerIndex(players)
+    lo, hi = index.prefix_range("ann")
+    assert hi - lo == 3
+    assert index.prefix_range("x") == (len(players), len(players))
+    assert len(index) == 5
+
+
+def test_empty_list():
+    index = PlayerIndex([])
+    assert index.query("", "elo") == [] and index.query("a", "name") == []
@@ -0,0 +1,102 @@
+"""
+Position Tests
+Bitboards and mailbox kept in step, board string and FEN parsing, move parsing
+"""
+
+import pytest
+from position import (Position, Move, WHITE, BLACK, EMPTY, CASTLE_ALL, CASTLE_WK, CASTLE_WQ,
+                      START_BOARD, square, coords, notation_to_square, square_to_notation,
+                      iter_squares, color_of)
+from movegen import legal_moves
+from perft import POSITIONS
+
+
+def assert_consistent(position):
+    """Every bitboard and occupancy mask matches the mailbox board"""
+    for piece, bitboard in position.bitboards.items():
+        assert [sq for sq in iter_squares(bitboard)] == \
+            [sq for sq, p in enumerate(position.board) if p == piece], piece
+    for color in (WHITE, BLACK):
+        assert position.occupancy[color] == sum(
+            1 << sq for sq, p in enumerate(position.board) if p != EMPTY and color_of(p) == color)
+
+
+def test_start_position():
+    position = Position()
+    assert position.to_board_string() == START_BOARD
+    assert position.side == WHITE and position.castling == CASTLE_ALL and position.ep_square == -1
+    assert position.piece_at(4, 7) == 'k' and position.piece_at(4, 0) == 'K'
+    assert position.king_square(WHITE) == square(4, 7)
+    assert position.color_at(0, 6) == WHITE and position.color_at(0, 1) == BLACK
+    assert position.color_at(3, 4) is None
+    assert_consistent(position)
+
+
+def test_notation_round_trip():
+    for sq in range(64):
+        assert notation_to_square(square_to_notation(sq)) == sq
+        assert square(*coords(sq)) == sq
+    assert square_to_notation(square(4, 6)) == "e2"
+    assert notation_to_square("E4") == square(4, 4)
+
+
+def test_from_fen_swaps_case():
+    position = Position.from_fen(POSITIONS["startpos"][0])
+    assert position == Position()
+
+
+def test_from_board_string_infers_castling_and_en_passant():
+    board = list(START_BOARD)
+    board[56] = EMPTY  # White a1 rook gone
+    position = Position.from_board_string("".join(board), side=BLACK, ep_col=4)
+    assert position.castling & (CASTLE_WK | CASTLE_WQ) == CASTLE_WK
+    assert position.ep_square == notation_to_square("e3")
+
+    with pytest.raises(ValueError):
+        Position.from_board_string("too short")
+
+
+@pytest.mark.parametrize("name", ["startpos", "kiwipete", "position3", "position4", "position5"])
+def test_make_unmake_restores_everything(name):
+    position = Position.from_fen(POSITIONS[name][0])
+    before = position.copy()
+    for move in legal_moves(position):
+        undo = position.make_move(move)
+        assert_consistent(position)
+        position.unmake_move(move, undo)
+        assert position == before, move
+        assert position.bitboards == before.bitboards and position.occupancy == before.occupancy
+
+
+def test_special_moves_update_the_board():
+    # Castling moves the rook
+    position = Position.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    position.make_move(position.parse_move("e1g1"))
+    assert position.piece_at(5, 7) == 'r' and position.piece_at(7, 7) == EMPTY
+    assert not position.castling & (CASTLE_WK | CASTLE_WQ)
+
+    # En passant removes the pawn beside the capturing one
+    position = Position.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    position.make_move(position.parse_move("e5d6"))
+    assert position.piece_at(3, 3) == EMPTY and position.piece_at(3, 2) == 'p'
+    assert_consistent(position)
+
+
+def test_move_between_promotes_only_pawns_on_the_last_rank():
+    position = Position.from_fen("8/P7/8/8/8/8/4P3/k6K w - - 0 1")
+    a7, a8 = notation_to_square("a7"), notation_to_square("a8")
+    e2, e4 = notation_to_square("e2"), notation_to_square("e4")
+
+    assert position.move_between(a7, a8) == Move(a7, a8, 'q')
+    assert position.move_between(a7, a8, 'N') == Move(a7, a8, 'n')
+    assert position.move_between(a7, a8, 'x') == Move(a7, a8, 'q')
+    # A stray letter on any other move is ignored
+    assert position.move_between(e2, e4, 'q') == Move(e2, e4)
+    assert position.parse_move("h1h2q") == Move(notation_to_square("h1"), notation_to_square("h2"))
+
+
+def test_parse_move_needs_a_piece_on_the_from_square():
+    position = Position()
+    assert position.parse_move("e4e5") is None
+    assert position.parse_move("e2") is None
+    assert position.parse_move("g1f3") == Move(notation_to_square("g1"), notation_to_square("f3"))
@@ -0,0 +1,79 @@
+"""
+Replay Tests
+Seeking through keyframes and deltas gives the same position as playing the game from the start
+"""
+
+import random
+import pytest
+from position import Position, notation_to_square
+from replay import Replay
+
+# Morphy's Opera Game in the server's move format (castling long at ply 23)
+REPLAY_MOVES = ["E2E4", "E7E5", "G1F3", "D7D6", "D2D4", "C8G4", "D4E5", "G4F3", "D1F3", "D6E5",
+                "F1C4", "G8F6", "F3B3", "D8E7", "B1C3", "C7C6", "C1G5", "B7B5", "C3B5", "C6B5",
+                "C4B5", "B8D7", "E1C1", "A8D8", "D1D7", "D8D7", "H1D1", "E7E6", "B5D7", "F6D7",
+                "B3B8", "D7B8", "D1D8"]
+
+
+def reference_positions(move_strings):
+    """Position after each ply, played one move at a time"""
+    position = Position()
+    positions = [position.copy()]
+    for text in move_strings:
+        move = position.parse_move(text)
+        if move:
+            position.make_move(move)
+        positions.append(position.copy())
+    return positions
+
+
+@pytest.mark.parametrize("interval", [1, 3, 8, 100])
+def test_every_seek_matches_the_reference(interval):
+    expected = reference_positions(REPLAY_MOVES)
+    replay = Replay(REPLAY_MOVES, keyframe_interval=interval)
+    plies = list(range(replay.ply_count + 1))
+    order = plies + plies[::-1] + random.Random(interval).choices(plies, k=200)
+    for ply in order:
+        assert replay.position_at(ply) == expected[ply], f"ply {ply}"
+        assert replay.ply == ply
+
+
+def test_decoding_is_lazy_and_bounded():
+    replay = Replay(REPLAY_MOVES, keyframe_interval=4)
+    assert replay.decoded_plies == 0 and replay.position_at(0) == Position()
+
+    assert not replay.decode(5)
+    assert replay.decoded_plies == 5
+
+    replay.position_at(20)  # Decodes up to the target on demand
+    assert replay.decoded_plies == 20
+    assert len(replay.keyframes) == 20 // 4 + 1
+
+    assert replay.decode(None) and replay.is_decoded
+
+
+def test_seek_is_clamped():
+    replay = Replay(REPLAY_MOVES)
+    assert replay.position_at(-5) == Position()
+    assert replay.position_at(10 ** 6) == reference_positions(REPLAY_MOVES)[-1]
+    assert replay.ply == replay.ply_count
+
+
+def test_promotion_letters():
+    moves = ["A2A4", "H7H5", "A4A5", "H5H4", "A5A6", "H4H3", "A6B7", "H3G2", "B7A8n", "G2H1q"]
+    final = Replay(moves).position_at(len(moves))
+    assert final.board[notation_to_square("a8")] == 'n'
+    assert final.board[notation_to_square("h1")] == 'Q'
+
+    # A letter on a move that does not promote is ignored
+    pushed = Replay(["E2E4q"]).position_at(1)
+    assert pushed.board[notation_to_square("e4")] == 'p'
+
+
+def test_move_from_an_empty_square_is_skipped():
+    replay = Replay(["E2E4", "E7E5", "E3E4", "G1F3"], keyframe_interval=2)
+    replay.decode(None)
+    assert replay.moves[2] is None
+    after_black = replay.position_at(2).copy()
+    assert replay.position_at(3) == after_black
+    assert replay.position_at(4).piece_at(5, 5) == 'n'
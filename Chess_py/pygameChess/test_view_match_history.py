@@ -0,0 +1,80 @@
+"""
+Match History View Tests
+Only the visible cards are drawn and clickable, drawn headless with the SDL dummy driver
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Before pygame opens a window
+
+from concurrent.futures import Future
+import pytest
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, MATCH_CARD_CACHE_SIZE
+from view_match_history import MatchHistoryView
+
+LIST_TOP = 150
+LIST_BOTTOM = SCREEN_HEIGHT - 120
+
+
+def make_matches(count):
+    return [{"matchId": f"{i:08x}-match", "white": "me", "black": "rival", "winner": "me",
+             "timestamp": 1700000000 + i, "moveCount": 40} for i in range(count)]
+
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.quit()
+
+
+@pytest.fixture
+def view(screen):
+    view = MatchHistoryView(screen, None, None)
+    view.set_session_data({"username": "me", "sessionId": "test"})
+    view.matches = make_matches(200)
+    view.draw()
+    return view
+
+
+def click(view, x, y):
+    view.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x, y)))
+    return view.get_selected_match_id()
+
+
+@pytest.mark.parametrize("scroll", [0, 1, 20, 119, 120, 139, 140, 141, 1000, 12345, None])
+def test_hit_rects_are_the_visible_cards(view, scroll):
+    view.scroll_offset = view.max_scroll if scroll is None else min(scroll, view.max_scroll)
+    view.draw()
+
+    ids = [match_id for _, match_id in view.card_rects]
+    expected = []
+    for i, match in enumerate(view.matches):
+        top = LIST_TOP + i * 140 - view.scroll_offset
+        if top + 120 > LIST_TOP and top < LIST_BOTTOM:
+            expected.append(match["matchId"])
+    assert ids == expected
+    for rect, _ in view.card_rects:
+        assert rect.height > 0 and LIST_TOP <= rect.top and rect.bottom <= LIST_BOTTOM
+
+
+def test_clicks_outside_the_list_select_nothing(view):
+    view.scroll_offset = 100  # First card is cut off at the top, the last at the bottom
+    view.draw()
+    assert click(view, SCREEN_WIDTH // 2, LIST_TOP - 10) is None
+    assert click(view, SCREEN_WIDTH // 2, LIST_BOTTOM + 10) is None
+    assert click(view, SCREEN_WIDTH // 2, LIST_TOP + 5) == view.matches[0]["matchId"]
+
+
+def test_card_cache_is_bounded(view):
+    for scroll in range(0, view.max_scroll, 400):
+        view.scroll_offset = scroll
+        view.draw()
+    assert len(view.card_cache) <= MATCH_CARD_CACHE_SIZE
+
+
+def test_update_picks_up_the_reply_without_drawing(view):
+    view.request = Future()
+    view.request.set_result({"action": "MATCH_HISTORY", "data": {"matches": make_matches(3)}})
+    view.update(0.016)
+    assert view.request is None and len(view.matches) == 3
@@ -0,0 +1,58 @@
+"""
+Text Cache
+Rendered text surfaces shared by the views and UI components
+"""
+
+from collections import OrderedDict
+from config import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """font.render() results keyed by (font, text, color, antialias), least recently used dropped first
+
+    A Font object stands for one face at one size, so the key covers the
+    font name and size too. Returned surfaces are shared between callers:
+    blit them, never draw on them or change their alpha (pass alpha= to
+    get a faded copy instead).
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color, antialias=True, alpha=None):
+        """Surface with text drawn in font and color; alpha below 255 returns a faded copy"""
+        # pygame.Color is not hashable; names and tuples are used as they are
+        key = (font, text, color if isinstance(color, (str, tuple)) else tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = self._surfaces[key] = font.render(text, antialias, color)
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+
+        if alpha is not None and alpha < 255:
+            surface = surface.copy()
+            surface.set_alpha(alpha)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface (e.g. after the display mode changed)"""
+        self._surfaces.clear()
+
+
+# Process-wide cache used through render_text()
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True, alpha=None):
+    """Rendered text from the shared cache (see TextCache.render)"""
+    return text_cache.render(font, text, color, antialias, alpha)
@@ -0,0 +1,246 @@
+"""
+Network Transports
+Byte-level connection backends used by NetworkClient: the C shared library
+(client_network.so via ctypes) or pure-Python asyncio streams
+"""
+
+import asyncio
+import ctypes
+import os
+import queue
+import threading
+from logger import get_logger
+
+log = get_logger("transport")
+
+# Must hold the C reader's whole ring buffer (READER_CAPACITY in client_network.c)
+RECEIVE_BUFFER_SIZE = 65536 + 1
+
+# Seconds, mirrors SO_SNDTIMEO / connect behaviour of the C library
+CONNECT_TIMEOUT = 5.0
+SEND_TIMEOUT = 5.0
+
+# Load C library
+try:
+    # Assuming library is in ../network_lib/client_network.so relative to this file
+    _lib_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "network_lib", "client_network.so")
+    _clib = ctypes.CDLL(_lib_path)
+
+    # Define argument/return types
+    _clib.connect_to_server.argtypes = [ctypes.c_char_p, ctypes.c_int]
+    _clib.connect_to_server.restype = ctypes.c_int
+
+    _clib.disconnect_server.argtypes = [ctypes.c_int]
+
+    _clib.shutdown_connection.argtypes = [ctypes.c_int]
+
+    _clib.send_message.argtypes = [ctypes.c_int, ctypes.c_char_p]
+    _clib.send_message.restype = ctypes.c_int
+
+    _clib.receive_messages.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_int]
+    _clib.receive_messages.restype = ctypes.c_int
+
+    _clib.check_connection.argtypes = [ctypes.c_int]
+    _clib.check_connection.restype = ctypes.c_int
+
+except OSError:
+    log.warning("Could not load C library at %s", _lib_path)
+    _clib = None
+
+
+class CLibTransport:
+    """One connection through client_network.so"""
+
+    def __init__(self):
+        self.fd = 0
+        self.buffer = ctypes.create_string_buffer(RECEIVE_BUFFER_SIZE)
+
+    def __str__(self):
+        return f"FD: {self.fd}"
+
+    def open(self, host, port):
+        """Connect to the server, returns True on success"""
+        fd = _clib.connect_to_server(host.encode('utf-8'), port)
+        if fd <= 0:
+            log.warning("Connection failed with code: %d", fd)
+            return False
+        self.fd = fd
+        return True
+
+    def shutdown(self):
+        """Wake up a receive blocked on this connection"""
+        if self.fd > 0:
+            _clib.shutdown_connection(self.fd)
+
+    def close(self):
+        """Release the socket"""
+        if self.fd > 0:
+            _clib.disconnect_server(self.fd)
+            self.fd = 0
+
+    def is_alive(self):
+        """Check if the socket is still usable"""
+        return self.fd > 0 and _clib.check_connection(self.fd) == 1
+
+    def send(self, payload):
+        """Send one frame (the C library appends the newline)"""
+        return self.fd > 0 and _clib.send_message(self.fd, payload) == 0
+
+    def receive(self, timeout):
+        """Return the complete frames available, waiting up to timeout seconds
+
+        Returns [] on timeout and None once the connection is closed.
+        """
+        if self.fd <= 0:
+            return None
+
+        timeout_ms = int(timeout * 1000) if timeout is not None else -1
+        bytes_read = _clib.receive_messages(self.fd, self.buffer, RECEIVE_BUFFER_SIZE, timeout_ms)
+        if bytes_read < 0:
+            return None
+        if bytes_read == 0:
+            return []
+
+        raw = ctypes.string_at(self.buffer, bytes_read)
+        return [frame for frame in raw.split(b"\n") if frame]
+
+
+class AsyncioTransport:
+    """One connection through asyncio streams
+
+    All sockets share one event loop running on a daemon thread. A pump
+    task splits the stream with readuntil() and queues the frames, so
+    receive() only waits on a queue and every call has its own timeout.
+    """
+
+    _loop = None
+    _loop_lock = threading.Lock()
+
+    @classmethod
+    def _get_loop(cls):
+        with cls._loop_lock:
+            if cls._loop is None:
+                cls._loop = asyncio.new_event_loop()
+                threading.Thread(target=cls._loop.run_forever, name="asyncio-transport",
+                                 daemon=True).start()
+            return cls._loop
+
+    def __init__(self):
+        self.loop = self._get_loop()
+        self.reader = None
+        self.writer = None
+        self.frames = queue.Queue()
+        self.closed = True
+
+    def __str__(self):
+        return "asyncio"
+
+    def _run(self, coro, timeout):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def open(self, host, port):
+        """Connect to the server, returns True on success"""
+        try:
+            self.reader, self.writer = self._run(
+                asyncio.wait_for(asyncio.open_connection(host, port, limit=RECEIVE_BUFFER_SIZE),
+                                 CONNECT_TIMEOUT),
+                CONNECT_TIMEOUT + 1.0)
+        except Exception as e:
+            log.warning("Connection failed: %r", e)
+            return False
+
+        self.closed = False
+        asyncio.run_coroutine_threadsafe(self._pump(), self.loop)
+        return True
+
+    async def _pump(self):
+        """Read newline-delimited frames until the stream ends"""
+        try:
+            while True:
+                try:
+                    frame = await self.reader.readuntil(b"\n")
+                except asyncio.LimitOverrunError:
+                    # Oversized frame: drop all of it, so its tail is not read as the next frame
+                    await self._skip_frame()
+                    continue
+                self.frames.put(frame.rstrip(b"\r\n"))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            self.frames.put(None)
+
+    async def _skip_frame(self):
+        """Discard the buffered frame up to and including its newline"""
+        while True:
+            try:
+                await self.reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as e:
+                # No newline within the limit yet: drop what was scanned and read on
+                await self.reader.readexactly(e.consumed)
+
+    async def _write(self, payload):
+        self.writer.write(payload)
+        await self.writer.drain()
+
+    def shutdown(self):
+        """Wake up a receive blocked on this connection"""
+        self.closed = True
+        self.frames.put(None)
+        if self.writer is not None:
+            self.loop.call_soon_threadsafe(self.writer.close)
+
+    def close(self):
+        """Release the socket"""
+        self.shutdown()
+        self.writer = None
+        self.reader = None
+
+    def is_alive(self):
+        """Check if the stream is still usable"""
+        return not self.closed and self.writer is not None and not self.writer.is_closing()
+
+    def send(self, payload):
+        """Send one frame, appending the newline delimiter"""
+        if not self.is_alive():
+            return False
+        try:
+            self._run(asyncio.wait_for(self._write(payload + b"\n"), SEND_TIMEOUT),
+                      SEND_TIMEOUT + 1.0)
+            return True
+        except Exception:
+            return False
+
+    def receive(self, timeout):
+        """Return the complete frames available, waiting up to timeout seconds
+
+        Returns [] on timeout and None once the connection is closed.
+        """
+        try:
+            frames = [self.frames.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while True:
+            try:
+                frames.append(self.frames.get_nowait())
+            except queue.Empty:
+                break
+
+        if None in frames:
+            # Keep the end-of-stream marker for later calls
+            self.frames.put(None)
+            frames = frames[:frames.index(None)]
+            return frames or None
+        return frames
+
+
+def create_transport(backend):
+    """Create a transport for the configured backend ("ctypes" or "asyncio")"""
+    if backend == "ctypes" and _clib is not None:
+        return CLibTransport()
+    if backend == "ctypes":
+        log.warning("C library not loaded, falling back to asyncio transport")
+    return AsyncioTransport()
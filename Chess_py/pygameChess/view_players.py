@@ -1,392 +1,504 @@
-"""
-Online Players View for Chess Client
-Shows list of online players and allows sending challenges
-"""
-
-import pygame
-from config import *
-
-
-class OnlinePlayersView:
-    """View for displaying online players and handling challenges"""
-    
-    def __init__(self, screen, network_client, async_handler=None, profile_modal=None):
-        self.screen = screen
-        self.network = network_client
-        self.async_handler = async_handler
-        self.profile_modal = profile_modal
-        self.font_title = pygame.font.Font(FONT_NAME, FONT_SIZE_TITLE)
-        self.font_large = pygame.font.Font(FONT_NAME, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(FONT_NAME, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(FONT_NAME, FONT_SIZE_SMALL)
-        
-        # Session data
-        self.my_username = ""
-        self.my_session_id = ""
-        
-        # Players data
-        self.online_players = []
-        self.selected_player = None
-        self.show_profile_popup = False
-        
-        # UI state
-        self.message = ""
-        self.message_color = COLOR_TEXT_SECONDARY
-        self._should_go_back = False
-        self._should_start_game = False
-        self.game_data = None
-        
-        # Scroll state
-        self.scroll_offset = 0
-        self.max_scroll = 0
-        
-        # UI rectangles
-        self.button_back = pygame.Rect(50, 800, 200, 60)
-        self.button_refresh = pygame.Rect(750, 800, 200, 60)
-        
-        # Player list area
-        self.list_area = pygame.Rect(150, 200, 700, 550)
-        self.player_rects = []
-        
-        # Profile popup
-        self.popup_rect = pygame.Rect(250, 250, 500, 450)
-        self.button_view_profile = pygame.Rect(280, 550, 160, 50)
-        self.button_challenge = pygame.Rect(460, 550, 160, 50)
-        self.button_close = pygame.Rect(370, 620, 160, 50)
-        
-    def set_session_data(self, session_data):
-        """Set session data from login"""
-        self.my_username = session_data.get("username", "Player")
-        self.my_session_id = session_data.get("sessionId", "")
-        
-    def load_online_players(self):
-        """Load online players from server"""
-        if not self.network.is_connected():
-            print("[OnlinePlayers] Not connected to server")
-            self.message = "Not connected to server"
-            self.message_color = COLOR_ERROR
-            self.online_players = []
-            return
-        
-        # Send REQUEST_PLAYER_LIST request
-        try:
-            success = self.network.send_message("REQUEST_PLAYER_LIST", {
-                "sessionId": self.my_session_id
-            })
-            
-            if not success:
-                print("[OnlinePlayers] Failed to send request")
-                self.message = "Failed to send request"
-                self.message_color = COLOR_ERROR
-                self.online_players = []
-                return
-            
-            # Wait for async_handler to receive response
-            if not self.async_handler:
-                print("[OnlinePlayers] No async handler available")
-                self.message = "No async handler available"
-                self.message_color = COLOR_ERROR
-                self.online_players = []
-                return
-            
-            # Wait up to 5 seconds for response
-            import time
-            timeout = 5.0
-            start_time = time.time()
-            
-            while time.time() - start_time < timeout:
-                data = self.async_handler.get_player_list()
-                if data:
-                    # Parse response
-                    players = data.get("players", [])
-                    print(f"[OnlinePlayers] Received {len(players)} players from server")
-                    
-                    # Filter out self and convert status
-                    self.online_players = []
-                    for p in players:
-                        if p.get("username") != self.my_username:
-                            # Convert server status to UI format
-                            status = p.get("status", "ONLINE")
-                            ui_status = "available" if status == "ONLINE" else "in_game"
-                            self.online_players.append({
-                                "username": p["username"],
-                                "status": ui_status,
-
-                                "wins": p.get("wins", 0),
-                                "losses": p.get("losses", 0)
-                            })
-                    
-                    self.message = f"Found {len(self.online_players)} players online"
-                    self.message_color = COLOR_SUCCESS
-                    return
-                
-                # Small delay before checking again
-                time.sleep(0.1)
-            
-            # Timeout
-            print("[OnlinePlayers] No response from server (timeout)")
-            self.message = "No response from server"
-            self.message_color = COLOR_ERROR
-            self.online_players = []
-                
-        except Exception as e:
-            print(f"[OnlinePlayers] Error loading players: {e}")
-            self.message = f"Error: {str(e)}"
-            self.message_color = COLOR_ERROR
-            self.online_players = []
-
-    def handle_event(self, event):
-        """Handle pygame events"""
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = event.pos
-            
-            if self.show_profile_popup:
-                # Handle popup buttons
-                if self.button_view_profile.collidepoint(mouse_pos):
-                    self.view_profile()
-                elif self.button_challenge.collidepoint(mouse_pos):
-                    self.send_challenge()
-                elif self.button_close.collidepoint(mouse_pos):
-                    self.show_profile_popup = False
-                    self.selected_player = None
-            else:
-                # Handle main view buttons
-                if self.button_back.collidepoint(mouse_pos):
-                    self._should_go_back = True
-                elif self.button_refresh.collidepoint(mouse_pos):
-                    self.load_online_players()
-                    self.message = "Players list refreshed"
-                    self.message_color = COLOR_SUCCESS
-                else:
-                    # Check player list clicks
-                    for i, rect in enumerate(self.player_rects):
-                        if rect.collidepoint(mouse_pos):
-                            self.selected_player = self.online_players[i]
-                            self.show_profile_popup = True
-                            break
-        
-        elif event.type == pygame.MOUSEWHEEL:
-            # Scroll through player list
-            if not self.show_profile_popup:
-                self.scroll_offset -= event.y * 30
-                self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
-    
-    def send_challenge(self):
-        """Send challenge to selected player"""
-        if not self.selected_player:
-            return
-        
-        target_username = self.selected_player["username"]
-        
-        # Send CHALLENGE to server
-        try:
-            success = self.network.send_message("CHALLENGE", {
-                "from": self.my_username,
-                "to": target_username
-            })
-            
-            if success:
-                self.message = f"Challenge sent to {target_username}!"
-                self.message_color = COLOR_SUCCESS
-                print(f"[OnlinePlayers] Challenge sent to {target_username}")
-            else:
-                self.message = "Failed to send challenge"
-                self.message_color = COLOR_ERROR
-                
-        except Exception as e:
-            print(f"[OnlinePlayers] Error sending challenge: {e}")
-            self.message = f"Error: {str(e)}"
-            self.message_color = COLOR_ERROR
-        
-        self.show_profile_popup = False
-        self.selected_player = None
-    
-    def view_profile(self):
-        """View detailed profile of selected player"""
-        if not self.selected_player or not self.profile_modal:
-            return
-        
-        username = self.selected_player["username"]
-        self.profile_modal.show(username, self.my_session_id)
-        self.show_profile_popup = False
-    
-    def draw(self):
-        """Draw the online players view"""
-        self.screen.fill(COLOR_BACKGROUND_PRIMARY)
-        
-        # Title
-        title_text = "Online Players"
-        title_surface = self.font_title.render(title_text, True, COLOR_TEXT)
-        title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title_surface, title_rect)
-        
-        # Player count
-        count_text = f"{len(self.online_players)} players online"
-        count_surface = self.font_small.render(count_text, True, COLOR_TEXT_SECONDARY)
-        count_rect = count_surface.get_rect(center=(SCREEN_WIDTH // 2, 160))
-        self.screen.blit(count_surface, count_rect)
-        
-        # Draw player list
-        self._draw_player_list()
-        
-        # Draw buttons
-        mouse_pos = pygame.mouse.get_pos()
-        self._draw_button(self.button_back, "Back", COLOR_ERROR, mouse_pos)
-        self._draw_button(self.button_refresh, "Refresh", COLOR_BUTTON_PRIMARY, mouse_pos)
-        
-        # Message
-        if self.message:
-            message_surface = self.font_small.render(self.message, True, self.message_color)
-            message_rect = message_surface.get_rect(center=(SCREEN_WIDTH // 2, 750))
-            self.screen.blit(message_surface, message_rect)
-        
-        # Draw popup if active
-        if self.show_profile_popup:
-            self._draw_profile_popup()
-    
-    def _draw_player_list(self):
-        """Draw the scrollable player list"""
-        # Draw list background
-        pygame.draw.rect(self.screen, (50, 50, 50), self.list_area)
-        pygame.draw.rect(self.screen, COLOR_INPUT_BORDER, self.list_area, 2)
-        
-        # Calculate player rectangles
-        self.player_rects = []
-        player_height = 80
-        spacing = 10
-        y_offset = self.list_area.y + 10 - self.scroll_offset
-        
-        mouse_pos = pygame.mouse.get_pos()
-        
-        for i, player in enumerate(self.online_players):
-            player_y = y_offset + i * (player_height + spacing)
-            
-            # Skip if outside visible area
-            if player_y + player_height < self.list_area.y or player_y > self.list_area.bottom:
-                continue
-            
-            player_rect = pygame.Rect(
-                self.list_area.x + 10,
-                player_y,
-                self.list_area.width - 20,
-                player_height
-            )
-            self.player_rects.append(player_rect)
-            
-            # Draw player card
-            hover = player_rect.collidepoint(mouse_pos) and not self.show_profile_popup
-            card_color = (70, 70, 70) if hover else (60, 60, 60)
-            pygame.draw.rect(self.screen, card_color, player_rect, border_radius=8)
-            
-            # Player name
-            name_surface = self.font_medium.render(player["username"], True, COLOR_TEXT)
-            self.screen.blit(name_surface, (player_rect.x + 20, player_rect.y + 10))
-            
-            # Status indicator
-            status_color = COLOR_SUCCESS if player["status"] == "available" else (150, 150, 150)
-            pygame.draw.circle(self.screen, status_color, (player_rect.right - 30, player_rect.centery), 8)
-            
-            # Stats
-            stats_text = f"W:{player['wins']} L:{player['losses']}"
-            stats_surface = self.font_small.render(stats_text, True, COLOR_TEXT_SECONDARY)
-            self.screen.blit(stats_surface, (player_rect.x + 20, player_rect.y + 45))
-        
-        # Calculate max scroll
-        total_height = len(self.online_players) * (player_height + spacing)
-        self.max_scroll = max(0, total_height - self.list_area.height + 20)
-    
-    def _draw_profile_popup(self):
-        """Draw the player profile popup"""
-        if not self.selected_player:
-            return
-        
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Popup background
-        pygame.draw.rect(self.screen, (40, 40, 40), self.popup_rect, border_radius=15)
-        pygame.draw.rect(self.screen, COLOR_BUTTON_PRIMARY, self.popup_rect, 3, border_radius=15)
-        
-        # Player name
-        name_text = self.selected_player["username"]
-        name_surface = self.font_large.render(name_text, True, COLOR_TEXT)
-        name_rect = name_surface.get_rect(center=(self.popup_rect.centerx, self.popup_rect.y + 80))
-        self.screen.blit(name_surface, name_rect)
-        
-        # Status
-        status_text = f"Status: {self.selected_player['status'].title()}"
-        status_color = COLOR_SUCCESS if self.selected_player['status'] == 'available' else COLOR_TEXT_SECONDARY
-        status_surface = self.font_small.render(status_text, True, status_color)
-        status_rect = status_surface.get_rect(center=(self.popup_rect.centerx, self.popup_rect.y + 140))
-        self.screen.blit(status_surface, status_rect)
-        
-        # Stats
-        wins = self.selected_player["wins"]
-        losses = self.selected_player["losses"]
-        total = wins + losses
-        winrate = (wins / total * 100) if total > 0 else 0
-        
-        stats_y = self.popup_rect.y + 200
-        stats_lines = [
-            f"Wins: {wins}",
-            f"Losses: {losses}",
-            f"Win Rate: {winrate:.1f}%"
-        ]
-        
-        for i, line in enumerate(stats_lines):
-            line_surface = self.font_medium.render(line, True, COLOR_TEXT)
-            line_rect = line_surface.get_rect(center=(self.popup_rect.centerx, stats_y + i * 40))
-            self.screen.blit(line_surface, line_rect)
-        
-        # Buttons
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # View Profile button (always available)
-        self._draw_button(self.button_view_profile, "View Profile", COLOR_ACCENT_PRIMARY, mouse_pos)
-        
-        # Only show Challenge button if player is available
-        if self.selected_player['status'] == 'available':
-            self._draw_button(self.button_challenge, "Challenge", COLOR_SUCCESS, mouse_pos)
-        else:
-            # Show disabled button
-            pygame.draw.rect(self.screen, (80, 80, 80), self.button_challenge, border_radius=8)
-            text_surface = self.font_medium.render("In Game", True, (150, 150, 150))
-            text_rect = text_surface.get_rect(center=self.button_challenge.center)
-            self.screen.blit(text_surface, text_rect)
-        
-        self._draw_button(self.button_close, "Close", COLOR_ERROR, mouse_pos)
-    
-    def _draw_button(self, rect, text, base_color, mouse_pos):
-        """Helper to draw a button with hover effect"""
-        hover_color = tuple(min(c + 30, 255) for c in base_color)
-        color = hover_color if rect.collidepoint(mouse_pos) else base_color
-        
-        pygame.draw.rect(self.screen, color, rect, border_radius=8)
-        
-        text_surface = self.font_medium.render(text, True, COLOR_BUTTON_TEXT)
-        text_rect = text_surface.get_rect(center=rect.center)
-        self.screen.blit(text_surface, text_rect)
-    
-    def should_go_back(self):
-        """Check if should return to menu"""
-        return self._should_go_back
-    
-    def should_start_game(self):
-        """Check if should start game"""
-        return self._should_start_game
-    
-    def get_game_data(self):
-        """Get game session data"""
-        return self.game_data
-    
-    def reset(self):
-        """Reset view state"""
-        self._should_go_back = False
-        self._should_start_game = False
-        self.show_profile_popup = False
-        self.selected_player = None
-        self.message = ""
-        self.scroll_offset = 0
+"""
+Online Players View for Chess Client
+Shows list of online players and allows sending challenges
+"""
+
+import pygame
+from config import *
+from ui_components import InputField, Spinner, get_overlay
+from player_index import PlayerIndex
+from fonts import get_font
+from text_cache import render_text
+from logger import get_logger
+
+log = get_logger("players")
+
+# Sort column -> button label (columns are player_index.SORT_KEYS)
+SORT_LABELS = {"name": "Name", "status": "Status", "wins": "Wins", "elo": "ELO"}
+
+
+class OnlinePlayersView:
+    """View for displaying online players and handling challenges"""
+    
+    def __init__(self, screen, network_client, async_handler=None, profile_modal=None):
+        self.screen = screen
+        self.network = network_client
+        self.async_handler = async_handler
+        self.profile_modal = profile_modal
+        self.font_title = get_font(FONT_SIZE_TITLE)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
+        
+        # Session data
+        self.my_username = ""
+        self.my_session_id = ""
+        
+        # Players data
+        self.online_players = []
+        self.player_index = None  # PlayerIndex of online_players, rebuilt when the list is replaced
+        self.selected_player = None
+        self.show_profile_popup = False
+        
+        # UI state
+        self.message = ""
+        self.message_color = COLOR_TEXT_SECONDARY
+        self._should_go_back = False
+        self._should_start_game = False
+        self.game_data = None
+        
+        # Scroll state
+        self.scroll_offset = 0
+        self.max_scroll = 0
+        
+        # Pending REQUEST_PLAYER_LIST (Future) and its spinner
+        self.request = None
+        self.spinner = Spinner(SCREEN_WIDTH // 2, 400)
+        
+        # UI rectangles
+        self.button_back = pygame.Rect(50, 800, 200, 60)
+        self.button_refresh = pygame.Rect(750, 800, 200, 60)
+        
+        # Search box (typing anywhere in the view filters by name prefix) and sort buttons
+        self.search = InputField(150, 145, 330, 44, placeholder="Type to search...",
+                                 font_size=FONT_SIZE_SMALL)
+        self.search.is_focused = True
+        self.search.focus_progress = 1.0
+        self.sort_key = "status"
+        self.sort_buttons = {sort: pygame.Rect(490 + i * 90, 145, 85, 44)
+                             for i, sort in enumerate(SORT_LABELS)}
+        
+        # Player list area
+        self.list_area = pygame.Rect(150, 205, 700, 530)
+        self.player_rects = []  # (rect, player) of the cards on screen
+        
+        # Profile popup
+        self.popup_rect = pygame.Rect(250, 250, 500, 450)
+        self.button_view_profile = pygame.Rect(280, 550, 160, 50)
+        self.button_challenge = pygame.Rect(460, 550, 160, 50)
+        self.button_close = pygame.Rect(370, 620, 160, 50)
+        
+    def set_session_data(self, session_data):
+        """Set session data from login"""
+        self.my_username = session_data.get("username", "Player")
+        self.my_session_id = session_data.get("sessionId", "")
+        
+    def load_online_players(self):
+        """Request online players from server (the list is filled in by update())"""
+        if not self.network.is_connected():
+            log.warning("Not connected to server")
+            self.message = "Not connected to server"
+            self.message_color = COLOR_ERROR
+            self.online_players = []
+            return
+        
+        if not self.async_handler:
+            log.warning("No async handler available")
+            self.message = "No async handler available"
+            self.message_color = COLOR_ERROR
+            self.online_players = []
+            return
+        
+        if self.request:
+            self.request.cancel()
+        
+        # Send REQUEST_PLAYER_LIST request; the async handler delivers the reply
+        self.request = self.async_handler.request("REQUEST_PLAYER_LIST", {
+            "sessionId": self.my_session_id
+        }, responses=("PLAYER_LIST",), timeout=PLAYER_LIST_TIMEOUT)
+        self.message = "Loading players..."
+        self.message_color = COLOR_TEXT_SECONDARY
+    
+    def _check_request(self):
+        """Take the response once the pending request has completed"""
+        if not self.request or not self.request.done():
+            return
+        
+        request = self.request
+        self.request = None
+        try:
+            response = request.result()
+        except TimeoutError:
+            log.warning("No response from server (timeout)")
+            self.message = "No response from server"
+            self.message_color = COLOR_ERROR
+            self.online_players = []
+            return
+        except Exception as e:
+            log.warning("Error loading players: %s", e)
+            self.message = f"Error: {str(e)}"
+            self.message_color = COLOR_ERROR
+            self.online_players = []
+            return
+        
+        if not response or response.get("action") != "PLAYER_LIST":
+            # ERROR replies echo the requestId too
+            reason = (response or {}).get("data", {}).get("reason", "Failed to load players")
+            log.warning("Error loading players: %s", reason)
+            self.message = f"Error: {reason}"
+            self.message_color = COLOR_ERROR
+            self.online_players = []
+            return
+        
+        # Parse response
+        players = response.get("data", {}).get("players", [])
+        log.info("Received %d players from server", len(players))
+        
+        # Filter out self and convert status
+        self.online_players = []
+        for p in players:
+            if p.get("username") != self.my_username:
+                # Convert server status to UI format
+                status = p.get("status", "ONLINE")
+                ui_status = "available" if status == "ONLINE" else "in_game"
+                self.online_players.append({
+                    "username": p["username"],
+                    "status": ui_status,
+                    "wins": p.get("wins", 0),
+                    "losses": p.get("losses", 0),
+                    "elo": p.get("elo", 1200)
+                })
+        
+        self.message = f"Found {len(self.online_players)} players online"
+        self.message_color = COLOR_SUCCESS
+    
+    def update(self, dt=0.016):
+        """Pick up the player list when it arrives, animate the spinner and the search cursor"""
+        self._check_request()
+        self.search.update(dt)
+        if self.request:
+            self.spinner.update(dt)
+    
+    def set_sort(self, sort):
+        """Order the list by a SORT_LABELS column"""
+        if sort != self.sort_key:
+            self.sort_key = sort
+            self.scroll_offset = 0
+    
+    def _filtered(self):
+        """Indices into online_players matching the search, in the chosen order"""
+        if self.player_index is None or self.player_index.players is not self.online_players:
+            self.player_index = PlayerIndex(self.online_players)
+        return self.player_index.query(self.search.text.strip().lower(), self.sort_key)
+
+    def handle_event(self, event):
+        """Handle pygame events"""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mouse_pos = event.pos
+            
+            if self.show_profile_popup:
+                # Handle popup buttons
+                if self.button_view_profile.collidepoint(mouse_pos):
+                    self.view_profile()
+                elif self.button_challenge.collidepoint(mouse_pos):
+                    self.send_challenge()
+                elif self.button_close.collidepoint(mouse_pos):
+                    self.show_profile_popup = False
+                    self.selected_player = None
+            else:
+                # Handle main view buttons
+                if self.button_back.collidepoint(mouse_pos):
+                    self._should_go_back = True
+                elif self.button_refresh.collidepoint(mouse_pos):
+                    self.load_online_players()
+                else:
+                    for sort, rect in self.sort_buttons.items():
+                        if rect.collidepoint(mouse_pos):
+                            self.set_sort(sort)
+                            break
+                    
+                    # Check player list clicks
+                    for rect, player in self.player_rects:
+                        if rect.collidepoint(mouse_pos):
+                            self.selected_player = player
+                            self.show_profile_popup = True
+                            break
+        
+        elif event.type == pygame.KEYDOWN and not self.show_profile_popup:
+            # Type-to-filter; Escape clears the search
+            text = self.search.text
+            if event.key == pygame.K_ESCAPE:
+                self.search.clear()
+            else:
+                self.search.handle_event(event)
+            if self.search.text != text:
+                self.scroll_offset = 0
+        
+        elif event.type == pygame.MOUSEWHEEL:
+            # Scroll through player list
+            if not self.show_profile_popup:
+                self.scroll_offset -= event.y * 30
+                self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
+    
+    def send_challenge(self):
+        """Send challenge to selected player"""
+        if not self.selected_player:
+            return
+        
+        target_username = self.selected_player["username"]
+        
+        # Send CHALLENGE to server
+        try:
+            success = self.network.send_message("CHALLENGE", {
+                "from": self.my_username,
+                "to": target_username
+            })
+            
+            if success:
+                self.message = f"Challenge sent to {target_username}!"
+                self.message_color = COLOR_SUCCESS
+                log.info("Challenge sent to %s", target_username)
+            else:
+                self.message = "Failed to send challenge"
+                self.message_color = COLOR_ERROR
+                
+        except Exception as e:
+            log.error("Error sending challenge: %s", e)
+            self.message = f"Error: {str(e)}"
+            self.message_color = COLOR_ERROR
+        
+        self.show_profile_popup = False
+        self.selected_player = None
+    
+    def view_profile(self):
+        """View detailed profile of selected player"""
+        if not self.selected_player or not self.profile_modal:
+            return
+        
+        username = self.selected_player["username"]
+        self.profile_modal.show(username, self.my_session_id)
+        self.show_profile_popup = False
+    
+    def draw(self):
+        """Draw the online players view (update() picks up the list and animates)"""
+        self.screen.fill(COLOR_BACKGROUND_PRIMARY)
+        
+        # Title
+        title_text = "Online Players"
+        title_surface = render_text(self.font_title, title_text, COLOR_TEXT)
+        title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 70))
+        self.screen.blit(title_surface, title_rect)
+        
+        # Player count
+        count_surface = render_text(self.font_small, self._count_text(), COLOR_TEXT_SECONDARY)
+        count_rect = count_surface.get_rect(center=(SCREEN_WIDTH // 2, 125))
+        self.screen.blit(count_surface, count_rect)
+        
+        # Search box and sort buttons
+        mouse_pos = pygame.mouse.get_pos()
+        self.search.draw(self.screen)
+        for sort, rect in self.sort_buttons.items():
+            color = COLOR_ACCENT_PRIMARY if sort == self.sort_key else COLOR_SURFACE
+            self._draw_button(rect, SORT_LABELS[sort], color, mouse_pos, self.font_small)
+        
+        # Draw player list (spinner until the first list arrives)
+        self._draw_player_list()
+        if self.request and not self.online_players:
+            self.spinner.draw(self.screen)
+        
+        # Draw buttons
+        self._draw_button(self.button_back, "Back", COLOR_ERROR, mouse_pos)
+        self._draw_button(self.button_refresh, "Refresh", COLOR_BUTTON_PRIMARY, mouse_pos)
+        
+        # Message
+        if self.message:
+            message_surface = render_text(self.font_small, self.message, self.message_color)
+            message_rect = message_surface.get_rect(center=(SCREEN_WIDTH // 2, 750))
+            self.screen.blit(message_surface, message_rect)
+        
+        # Draw popup if active
+        if self.show_profile_popup:
+            self._draw_profile_popup()
+
+    def regions(self):
+        """(name, rect, key) for each part draw() paints; a changed key means it must be repainted"""
+        mouse_pos = pygame.mouse.get_pos()
+        popup = None
+        if self.show_profile_popup and self.selected_player:
+            # The popup dims the whole screen
+            popup = (self.selected_player["username"], self.selected_player["status"],
+                     self.button_view_profile.collidepoint(mouse_pos),
+                     self.button_challenge.collidepoint(mouse_pos),
+                     self.button_close.collidepoint(mouse_pos))
+        yield "players_popup", self.screen.get_rect(), popup
+
+        # While loading, the spinner turns every frame
+        loading = self.spinner.angle if self.request else None
+        hovered = -1 if popup else next(
+            (i for i, (rect, _) in enumerate(self.player_rects) if rect.collidepoint(mouse_pos)), -1)
+        yield "players_count", (0, 110, SCREEN_WIDTH, 30), self._count_text()
+        sort_hovered = next((sort for sort, rect in self.sort_buttons.items() if rect.collidepoint(mouse_pos)), None)
+        yield "players_search", (150, 140, 700, 54), \
+            (self.search.text, bool(self.search.text) and self.search.cursor_visible, self.sort_key, sort_hovered)
+        yield "players_list", self.list_area, \
+            (loading, id(self.online_players), len(self.online_players), self.search.text, self.sort_key,
+             self.scroll_offset, hovered)
+        yield "players_message", (0, 735, SCREEN_WIDTH, 30), (self.message, self.message_color)
+        yield "players_back", self.button_back, self.button_back.collidepoint(mouse_pos)
+        yield "players_refresh", self.button_refresh, self.button_refresh.collidepoint(mouse_pos)
+
+    def _count_text(self):
+        """'N players online', or how many of them match the search"""
+        if self.search.text:
+            return f"{len(self._filtered())} of {len(self.online_players)} players match"
+        return f"{len(self.online_players)} players online"
+    
+    def _draw_player_list(self):
+        """Draw the cards in the visible part of the list (the others are never looked at)"""
+        # Draw list background
+        pygame.draw.rect(self.screen, (50, 50, 50), self.list_area)
+        pygame.draw.rect(self.screen, COLOR_INPUT_BORDER, self.list_area, 2)
+        
+        order = self._filtered()
+        player_height = 80
+        spacing = 10
+        pitch = player_height + spacing
+        
+        # Calculate max scroll
+        total_height = len(order) * pitch
+        self.max_scroll = max(0, total_height - self.list_area.height + 20)
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll)
+        
+        # Cards that reach into the list area: bottom >= its top, top <= its bottom
+        first = max(0, -((player_height + 10 - self.scroll_offset) // pitch))
+        last = min(len(order), (self.scroll_offset + self.list_area.height - 10) // pitch + 1)
+        
+        # Cards at the edges are cut at the list border
+        inner = self.list_area.inflate(-4, -4)
+        self.screen.set_clip(inner)
+        self.player_rects = []
+        mouse_pos = pygame.mouse.get_pos()
+        
+        for i in range(first, last):
+            player = self.online_players[order[i]]
+            player_rect = pygame.Rect(
+                self.list_area.x + 10,
+                self.list_area.y + 10 + i * pitch - self.scroll_offset,
+                self.list_area.width - 20,
+                player_height
+            )
+            self.player_rects.append((player_rect.clip(inner), player))
+            
+            # Draw player card
+            hover = player_rect.collidepoint(mouse_pos) and inner.collidepoint(mouse_pos) \
+                and not self.show_profile_popup
+            card_color = (70, 70, 70) if hover else (60, 60, 60)
+            pygame.draw.rect(self.screen, card_color, player_rect, border_radius=8)
+            
+            # Player name
+            name_surface = render_text(self.font_medium, player["username"], COLOR_TEXT)
+            self.screen.blit(name_surface, (player_rect.x + 20, player_rect.y + 10))
+            
+            # Status indicator
+            status_color = COLOR_SUCCESS if player["status"] == "available" else (150, 150, 150)
+            pygame.draw.circle(self.screen, status_color, (player_rect.right - 30, player_rect.centery), 8)
+            
+            # ELO
+            elo_surface = render_text(self.font_medium, f"ELO {player['elo']}", COLOR_TEXT)
+            self.screen.blit(elo_surface, elo_surface.get_rect(right=player_rect.right - 60,
+                                                               centery=player_rect.centery))
+            
+            # Stats
+            stats_text = f"W:{player['wins']} L:{player['losses']}"
+            stats_surface = render_text(self.font_small, stats_text, COLOR_TEXT_SECONDARY)
+            self.screen.blit(stats_surface, (player_rect.x + 20, player_rect.y + 45))
+        
+        self.screen.set_clip(None)
+        
+        if self.search.text and not order:
+            empty_surface = render_text(self.font_medium, "No players match", COLOR_TEXT_MUTED)
+            self.screen.blit(empty_surface, empty_surface.get_rect(center=self.list_area.center))
+    
+    def _draw_profile_popup(self):
+        """Draw the player profile popup"""
+        if not self.selected_player:
+            return
+        
+        # Semi-transparent overlay
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0), 180), (0, 0))
+        
+        # Popup background
+        pygame.draw.rect(self.screen, (40, 40, 40), self.popup_rect, border_radius=15)
+        pygame.draw.rect(self.screen, COLOR_BUTTON_PRIMARY, self.popup_rect, 3, border_radius=15)
+        
+        # Player name
+        name_text = self.selected_player["username"]
+        name_surface = render_text(self.font_large, name_text, COLOR_TEXT)
+        name_rect = name_surface.get_rect(center=(self.popup_rect.centerx, self.popup_rect.y + 80))
+        self.screen.blit(name_surface, name_rect)
+        
+        # Status
+        status_text = f"Status: {self.selected_player['status'].title()}"
+        status_color = COLOR_SUCCESS if self.selected_player['status'] == 'available' else COLOR_TEXT_SECONDARY
+        status_surface = render_text(self.font_small, status_text, status_color)
+        status_rect = status_surface.get_rect(center=(self.popup_rect.centerx, self.popup_rect.y + 140))
+        self.screen.blit(status_surface, status_rect)
+        
+        # Stats
+        wins = self.selected_player["wins"]
+        losses = self.selected_player["losses"]
+        total = wins + losses
+        winrate = (wins / total * 100) if total > 0 else 0
+        
+        stats_y = self.popup_rect.y + 200
+        stats_lines = [
+            f"Wins: {wins}",
+            f"Losses: {losses}",
+            f"Win Rate: {winrate:.1f}%"
+        ]
+        
+        for i, line in enumerate(stats_lines):
+            line_surface = render_text(self.font_medium, line, COLOR_TEXT)
+            line_rect = line_surface.get_rect(center=(self.popup_rect.centerx, stats_y + i * 40))
+            self.screen.blit(line_surface, line_rect)
+        
+        # Buttons
+        mouse_pos = pygame.mouse.get_pos()
+        
+        # View Profile button (always available)
+        self._draw_button(self.button_view_profile, "View Profile", COLOR_ACCENT_PRIMARY, mouse_pos)
+        
+        # Only show Challenge button if player is available
+        if self.selected_player['status'] == 'available':
+            self._draw_button(self.button_challenge, "Challenge", COLOR_SUCCESS, mouse_pos)
+        else:
+            # Show disabled button
+            pygame.draw.rect(self.screen, (80, 80, 80), self.button_challenge, border_radius=8)
+            text_surface = render_text(self.font_medium, "In Game", (150, 150, 150))
+            text_rect = text_surface.get_rect(center=self.button_challenge.center)
+            self.screen.blit(text_surface, text_rect)
+        
+        self._draw_button(self.button_close, "Close", COLOR_ERROR, mouse_pos)
+    
+    def _draw_button(self, rect, text, base_color, mouse_pos, font=None):
+        """Helper to draw a button with hover effect"""
+        hover_color = tuple(min(c + 30, 255) for c in base_color)
+        color = hover_color if rect.collidepoint(mouse_pos) else base_color
+        
+        pygame.draw.rect(self.screen, color, rect, border_radius=8)
+        
+        text_surface = render_text(font or self.font_medium, text, COLOR_BUTTON_TEXT)
+        text_rect = text_surface.get_rect(center=rect.center)
+        self.screen.blit(text_surface, text_rect)
+    
+    def should_go_back(self):
+        """Check if should return to menu"""
+        return self._should_go_back
+    
+    def should_start_game(self):
+        """Check if should start game"""
+        return self._should_start_game
+    
+    def get_game_data(self):
+        """Get game session data"""
+        return self.game_data
+    
+    def reset(self):
+        """Reset view state"""
+        self._should_go_back = False
+        self._should_start_game = False
+        self.show_profile_popup = False
+        self.selected_player = None
+        self.message = ""
+        self.scroll_offset = 0
+        self.search.clear()
@@ -0,0 +1,166 @@
+/**
+ * perft.c - Đếm số nút cây nước đi (perft) bằng luật của server
+ *
+ * Dùng is_valid_move / execute_move của game_manager.c để kiểm tra tính đúng
+ * và đo tốc độ sinh nước đi của server trên các thế cờ chuẩn.
+ *
+ * Cách dùng:
+ *   ./perft <depth> [fen]           Tổng số nút (mặc định: thế cờ ban đầu)
+ *   ./perft <depth> [fen] divide    Số nút theo từng nước đi đầu tiên ("e2e4: 20")
+ *
+ * FEN theo chuẩn (chữ hoa = trắng); được đổi sang quy ước của server
+ * (chữ thường = trắng) khi nạp.
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <ctype.h>
+#include <time.h>
+#include "cJSON.h"
+#include "server.h"
+
+#define START_FEN "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+int is_valid_move(Match *match, int from_row, int from_col, int to_row, int to_col, int player_turn);
+void execute_move(Match *match, int from_row, int from_col, int to_row, int to_col, char promotion_piece);
+
+static const char PROMOTIONS[] = {'q', 'r', 'b', 'n'};
+
+/**
+ * load_fen - Nạp thế cờ FEN vào match
+ * Return: 0 nếu thành công, -1 nếu FEN sai
+ */
+static int load_fen(Match *match, const char *fen)
+{
+    char placement[128], side[4] = "w", castling[8] = "-", ep[4] = "-";
+    if (sscanf(fen, "%127s %3s %7s %3s", placement, side, castling, ep) < 1)
+        return -1;
+
+    memset(match, 0, sizeof(*match));
+    int row = 0, col = 0;
+    for (const char *c = placement; *c; c++)
+    {
+        if (*c == '/')
+        {
+            row++;
+            col = 0;
+        }
+        else if (isdigit((unsigned char)*c))
+        {
+            for (int i = 0; i < *c - '0' && col < 8; i++)
+                match->board[row][col++] = '.';
+        }
+        else if (row < 8 && col < 8)
+        {
+            // Đảo chữ hoa/thường: server dùng chữ thường cho quân trắng
+            match->board[row][col++] = isupper((unsigned char)*c) ? tolower(*c) : toupper(*c);
+        }
+    }
+    if (row != 7 || col != 8)
+        return -1;
+
+    match->current_turn = (side[0] == 'b') ? 1 : 0;
+
+    // Server lưu "đã di chuyển" thay vì quyền nhập thành
+    match->white_king_moved = !strchr(castling, 'K') && !strchr(castling, 'Q');
+    match->black_king_moved = !strchr(castling, 'k') && !strchr(castling, 'q');
+    match->white_rook_h_moved = !strchr(castling, 'K');
+    match->white_rook_a_moved = !strchr(castling, 'Q');
+    match->black_rook_h_moved = !strchr(castling, 'k');
+    match->black_rook_a_moved = !strchr(castling, 'q');
+
+    match->en_passant_col = (ep[0] >= 'a' && ep[0] <= 'h') ? ep[0] - 'a' : -1;
+    return 0;
+}
+
+/**
+ * perft - Số nút lá ở độ sâu depth
+ * @divide: 1 để in số nút của từng nước đi đầu tiên
+ */
+static long long perft(Match *match, int depth, int divide)
+{
+    if (depth == 0)
+        return 1;
+
+    long long nodes = 0;
+    int turn = match->current_turn;
+
+    for (int from = 0; from < 64; from++)
+    {
+        int from_row = from / 8, from_col = from % 8;
+        char piece = match->board[from_row][from_col];
+        if (piece == '.' || ((piece >= 'a' && piece <= 'z') != (turn == 0)))
+            continue;
+
+        for (int to = 0; to < 64; to++)
+        {
+            int to_row = to / 8, to_col = to % 8;
+            if (!is_valid_move(match, from_row, from_col, to_row, to_col, turn))
+                continue;
+
+            // Tốt lên hàng cuối: mỗi quân phong cấp là một nước đi riêng
+            int promotes = tolower(piece) == 'p' && (to_row == 0 || to_row == 7);
+            int variants = promotes ? 4 : 1;
+
+            for (int v = 0; v < variants; v++)
+            {
+                char promotion = promotes ? PROMOTIONS[v] : '\0';
+                Match next = *match;
+                execute_move(&next, from_row, from_col, to_row, to_col, promotion);
+                next.current_turn = 1 - turn;
+
+                long long count = perft(&next, depth - 1, 0);
+                nodes += count;
+
+                if (divide)
+                {
+                    printf("%c%d%c%d", 'a' + from_col, 8 - from_row, 'a' + to_col, 8 - to_row);
+                    if (promotion)
+                        printf("%c", promotion);
+                    printf(": %lld\n", count);
+                }
+            }
+        }
+    }
+    return nodes;
+}
+
+int main(int argc, char *argv[])
+{
+    if (argc < 2)
+    {
+        fprintf(stderr, "Usage: %s <depth> [fen] [divide]\n", argv[0]);
+        return 1;
+    }
+
+    int depth = atoi(argv[1]);
+    const char *fen = START_FEN;
+    int divide = 0;
+    for (int i = 2; i < argc; i++)
+    {
+        if (strcmp(argv[i], "divide") == 0)
+            divide = 1;
+        else
+            fen = argv[i];
+    }
+
+    static Match match;
+    if (load_fen(&match, fen) != 0)
+    {
+        fprintf(stderr, "Invalid FEN: %s\n", fen);
+        return 1;
+    }
+
+    struct timespec start, end;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    long long nodes = perft(&match, depth, divide);
+    clock_gettime(CLOCK_MONOTONIC, &end);
+
+    double seconds = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+    if (divide)
+        printf("\n");
+    printf("Nodes: %lld\n", nodes);
+    printf("Time: %.3fs (%.0f nodes/sec)\n", seconds, seconds > 0 ? nodes / seconds : 0.0);
+    return 0;
+}